@@ -0,0 +1,197 @@
+"""
+api.py - Headless HTTP API over post_generator
+Run with: uvicorn api:app --host 0.0.0.0 --port 8000
+
+Single posts use the async generation path, so they share groq_llm's pooled
+AsyncGroq client on the server's event loop. Multi-variant and file jobs run
+the thread-pooled generators off the loop, with a cap on how many run at once.
+Identical requests that arrive while one is already running wait for that one
+instead of starting their own.
+"""
+
+import asyncio
+import json
+import os
+from contextlib import asynccontextmanager
+from typing import Any, Callable, Dict, List, Optional
+
+from fastapi import FastAPI, File, Form, HTTPException, UploadFile
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import JSONResponse
+from groq import RateLimitError
+from pydantic import BaseModel, Field, ValidationError
+
+from file_handler import MAX_FILE_SIZE, create_file_based_prompt, process_uploaded_file
+from few_shot import get_store
+from groq_llm import get_async_client
+from post_generator import (
+    DEFAULT_MAX_CONCURRENCY,
+    MODEL_VARIANTS,
+    TONES,
+    agenerate_post,
+    generate_variants,
+)
+from singleflight import SingleFlight
+
+# Multi-variant/file jobs each hold a worker pool; cap how many run at once per process
+MAX_CONCURRENT_JOBS = int(os.getenv("LINKGEN_API_MAX_JOBS", "16"))
+
+
+class GenerateRequest(BaseModel):
+    topic: str = Field(..., min_length=1, description="Topic or full prompt for the post")
+    length: str = Field("Medium", description="Short, Medium or Long")
+    language: str = Field("English", description="English, Hindi or Kannada")
+    custom_prompt: Optional[str] = None
+    few_shot_k: int = Field(0, ge=0, le=5, description="Curated example posts to add to the prompt")
+
+
+class VariantsRequest(GenerateRequest):
+    max_concurrency: int = Field(DEFAULT_MAX_CONCURRENCY, ge=1, le=8)
+
+
+class PostResponse(BaseModel):
+    post: str
+    hashtags: List[str]
+    engagement: Optional[float] = None
+
+
+class VariantsResponse(BaseModel):
+    variants: Dict[str, Dict[str, Any]]
+
+
+class FilePostResponse(PostResponse):
+    filename: str
+    content_chars: int
+
+
+# Whole requests are coalesced here; groq_llm also coalesces the individual completions
+_inflight = SingleFlight()
+_job_slots: Optional[asyncio.Semaphore] = None
+
+
+def _request_key(endpoint: str, request: BaseModel) -> str:
+    return endpoint + ":" + json.dumps(request.model_dump(), sort_keys=True)
+
+
+async def _run_job(func: Callable, *args, **kwargs) -> Any:
+    """Run a blocking generator in a worker thread, within the per-process job cap."""
+    async with _job_slots:
+        return await asyncio.to_thread(func, *args, **kwargs)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global _job_slots
+    _job_slots = asyncio.Semaphore(MAX_CONCURRENT_JOBS)
+    # Create the pooled client on the server loop and load the example index before traffic arrives
+    get_async_client()
+    await asyncio.to_thread(get_store().get)
+    yield
+
+
+app = FastAPI(title="LinkGen AI", lifespan=lifespan)
+
+
+@app.exception_handler(RateLimitError)
+async def rate_limited(request, exc: RateLimitError):
+    retry_after = exc.response.headers.get("retry-after") if exc.response is not None else None
+    headers = {"Retry-After": retry_after} if retry_after else None
+    return JSONResponse({"detail": "Upstream rate limit reached, retry later"}, status_code=429, headers=headers)
+
+
+@app.get("/health")
+async def health() -> Dict[str, Any]:
+    return {"status": "ok", "tones": list(TONES), "models": MODEL_VARIANTS}
+
+
+@app.post("/generate", response_model=PostResponse)
+async def generate(request: GenerateRequest) -> Dict[str, Any]:
+    return await _inflight.ado(
+        _request_key("generate", request),
+        lambda: agenerate_post(
+            request.topic, request.length, request.language,
+            custom_prompt=request.custom_prompt, few_shot_k=request.few_shot_k,
+        ),
+    )
+
+
+async def _variants(request: VariantsRequest, include_tones: bool, include_models: bool) -> Dict[str, Any]:
+    result = await _run_job(
+        generate_variants,
+        topic=request.topic,
+        length=request.length,
+        language=request.language,
+        custom_prompt=request.custom_prompt,
+        few_shot_k=request.few_shot_k,
+        include_tones=include_tones,
+        include_models=include_models,
+        max_concurrency=request.max_concurrency,
+    )
+    return {"variants": result["tones"] if include_tones else result["models"]}
+
+
+@app.post("/multi-tone", response_model=VariantsResponse)
+async def multi_tone(request: VariantsRequest) -> Dict[str, Any]:
+    return await _inflight.ado(
+        _request_key("multi-tone", request),
+        lambda: _variants(request, include_tones=True, include_models=False),
+    )
+
+
+@app.post("/multi-model", response_model=VariantsResponse)
+async def multi_model(request: VariantsRequest) -> Dict[str, Any]:
+    return await _inflight.ado(
+        _request_key("multi-model", request),
+        lambda: _variants(request, include_tones=False, include_models=True),
+    )
+
+
+class _Upload:
+    """Adapts a FastAPI UploadFile to the attributes process_uploaded_file reads."""
+
+    def __init__(self, upload: UploadFile):
+        self.name = upload.filename or ""
+        self.type = upload.content_type or ""
+        self.size = upload.size
+        self._file = upload.file
+
+    def read(self, size: int = -1) -> bytes:
+        return self._file.read(size)
+
+    def seek(self, offset: int, whence: int = 0) -> int:
+        return self._file.seek(offset, whence)
+
+    def tell(self) -> int:
+        return self._file.tell()
+
+    def seekable(self) -> bool:
+        return True
+
+
+@app.post("/file-to-post", response_model=FilePostResponse)
+async def file_to_post(
+    file: UploadFile = File(...),
+    length: str = Form("Medium"),
+    language: str = Form("English"),
+    few_shot_k: int = Form(0, ge=0, le=5),
+) -> Dict[str, Any]:
+    if file.size is not None and file.size > MAX_FILE_SIZE:
+        raise HTTPException(status_code=413, detail="File size exceeds 10MB limit")
+
+    extracted = await _run_job(process_uploaded_file, _Upload(file))
+    if extracted.get("error"):
+        raise HTTPException(status_code=422, detail=extracted["error"])
+
+    prompt = create_file_based_prompt(extracted["content"], extracted["file_type"])
+    try:
+        request = GenerateRequest(topic=prompt, length=length, language=language, few_shot_k=few_shot_k)
+    except ValidationError as e:
+        raise RequestValidationError(e.errors())
+    result = await generate(request)
+    return {**result, "filename": extracted["filename"], "content_chars": len(extracted["content"])}
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    uvicorn.run("api:app", host=os.getenv("HOST", "0.0.0.0"), port=int(os.getenv("PORT", "8000")))
@@ -0,0 +1,160 @@
+"""
+batch_cli.py - Generate posts in bulk from a CSV or JSONL file
+Usage: python batch_cli.py calendar.csv [-o results.jsonl] [--concurrency 4] [--few-shot-k 0]
+
+Each input row has topic, length, language, tone and custom_prompt columns (only
+topic is required). Rows are generated a few at a time through post_generator,
+so every request goes through the shared rate limiter in groq_llm. Each result
+is appended to the output JSONL as soon as it finishes; rerunning the same
+command skips rows already generated and retries the ones that failed.
+"""
+
+import argparse
+import csv
+import hashlib
+import json
+import os
+import sys
+import time
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from jsonl_io import iter_journal, iter_records, run_journaled
+from post_generator import DEFAULT_MAX_CONCURRENCY, TONES, generate_custom_tone_post, generate_post
+
+ROW_FIELDS = ("topic", "length", "language", "tone", "custom_prompt")
+ROW_DEFAULTS = {"length": "Medium", "language": "English", "tone": "", "custom_prompt": ""}
+# generate_post already writes in this tone; other tones go through generate_custom_tone_post
+DEFAULT_TONE = "professional"
+_TONES_BY_NAME = {name.lower(): (name, description) for name, description in TONES.items()}
+
+
+def read_rows(path: str) -> Iterator[Dict[str, str]]:
+    """Yield normalized rows from a .csv file or a .jsonl/.json file of objects."""
+    if path.lower().endswith(".csv"):
+        with open(path, encoding="utf-8-sig", newline="") as f:
+            records = list(csv.DictReader(f))
+    else:
+        records = iter_records(path)
+    for record in records:
+        row = {field: str(record.get(field) or ROW_DEFAULTS.get(field, "")).strip() for field in ROW_FIELDS}
+        if row["topic"]:
+            yield row
+
+
+def row_keys(rows: List[Dict[str, str]]) -> List[str]:
+    """
+    Stable key per row: a hash of its fields plus how many identical rows came
+    before it, so keys survive rows being added or reordered in the input file.
+    """
+    keys, seen = [], {}
+    for row in rows:
+        content = json.dumps([row[field] for field in ROW_FIELDS])
+        occurrence = seen.get(content, 0)
+        seen[content] = occurrence + 1
+        digest = hashlib.sha256(content.encode("utf-8", "surrogatepass")).hexdigest()[:16]
+        keys.append(f"{digest}:{occurrence}")
+    return keys
+
+
+def load_done(output_path: str) -> Set[str]:
+    """Keys of rows the output file already holds a successful result for."""
+    return {entry["key"] for entry in iter_journal(output_path) if entry.get("status") == "ok"}
+
+
+def generate_row(row: Dict[str, str], few_shot_k: int = 0, seed: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Generate one post for a row, picking the generator from its tone.
+    Repeated rows pass a different seed, so they don't get the cached post of the first one.
+    """
+    custom_prompt = row["custom_prompt"] or None
+    tone = row["tone"]
+    if not tone or tone.lower() == DEFAULT_TONE:
+        return generate_post(row["topic"], row["length"], row["language"],
+                             custom_prompt=custom_prompt, few_shot_k=few_shot_k, seed=seed)
+
+    # Known tone names use their full description; anything else is a free-form tone
+    name, description = _TONES_BY_NAME.get(tone.lower(), (tone, tone))
+    result = generate_custom_tone_post(row["topic"], row["length"], row["language"], description,
+                                       custom_prompt=custom_prompt, few_shot_k=few_shot_k, seed=seed)
+    result["tone"] = name
+    return result
+
+
+def _format_duration(seconds: float) -> str:
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}" if hours else f"{minutes}:{seconds:02d}"
+
+
+def run_batch(input_path: str, output_path: str, concurrency: int = DEFAULT_MAX_CONCURRENCY,
+              few_shot_k: int = 0) -> Tuple[int, int]:
+    """
+    Generate every row of input_path not already in output_path, `concurrency`
+    at a time, appending one JSONL entry per row as it finishes.
+    Returns (rows generated, rows failed) for this run.
+    """
+    rows = list(read_rows(input_path))
+    keys = row_keys(rows)
+    done = load_done(output_path)
+    pending = [(index, key, row) for index, (key, row) in enumerate(zip(keys, rows)) if key not in done]
+    total = len(pending)
+    print(f"{len(rows)} rows in {input_path}: {len(rows) - total} already done, {total} to generate.")
+    if not total:
+        return 0, 0
+
+    generated = failed = 0
+    started = time.monotonic()
+
+    def work(item):
+        _, row, seed = item
+        return generate_row(row, few_shot_k, seed)
+
+    def to_entry(key, item, result, error):
+        index, row, _ = item
+        if error is not None:
+            return {"key": key, "row": index, "input": row, "status": "error",
+                    "error": f"{type(error).__name__}: {error}"}
+        return {"key": key, "row": index, "input": row, "status": "ok", "result": result}
+
+    # The nth repeat of a row uses seed n (the first keeps seed None and can hit the cache)
+    tasks = ((key, (index, row, int(key.rsplit(":", 1)[1]) or None)) for index, key, row in pending)
+    for entry in run_journaled(tasks, work, output_path, to_entry, concurrency):
+        if entry["status"] == "ok":
+            generated += 1
+        else:
+            failed += 1
+        finished = generated + failed
+        elapsed = time.monotonic() - started
+        rate = finished / elapsed if elapsed else 0.0
+        eta = _format_duration((total - finished) / rate) if rate else "?"
+        status = "ok" if entry["status"] == "ok" else "FAILED " + entry["error"]
+        print(f"[{finished}/{total}] row {entry['row']} {status} | "
+              f"{rate * 60:.1f} rows/min, elapsed {_format_duration(elapsed)}, ETA {eta}")
+
+    elapsed = time.monotonic() - started
+    print(f"Generated {generated} posts, {failed} failed, in {_format_duration(elapsed)}."
+          + (" Rerun the same command to retry failed rows." if failed else ""))
+    return generated, failed
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Generate LinkedIn posts in bulk from a CSV or JSONL file.")
+    parser.add_argument("input", help="CSV or JSONL/JSON file with topic, length, language, tone, custom_prompt")
+    parser.add_argument("-o", "--output", help="Results JSONL (default: <input>.results.jsonl); reruns resume from it")
+    parser.add_argument("-c", "--concurrency", type=int, default=DEFAULT_MAX_CONCURRENCY,
+                        help=f"Posts generated at the same time (default: {DEFAULT_MAX_CONCURRENCY})")
+    parser.add_argument("--few-shot-k", type=int, default=0,
+                        help="Curated example posts to add to each prompt (default: 0)")
+    args = parser.parse_args(argv)
+
+    output = args.output or os.path.splitext(args.input)[0] + ".results.jsonl"
+    try:
+        _, failed = run_batch(args.input, output, max(1, args.concurrency), args.few_shot_k)
+    except KeyboardInterrupt:
+        print(f"\nInterrupted; finished rows are saved in {output}. Rerun to resume.")
+        return 130
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
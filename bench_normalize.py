@@ -0,0 +1,192 @@
+"""
+bench_normalize.py - Microbenchmark for text_normalize
+Times the cleaning pipeline against the previous per-call implementation
+(kept below as the baseline) on a large batch of generated-post shapes.
+
+Usage: python bench_normalize.py [batch_size] [repeats]
+"""
+
+import ast
+import html
+import json
+import random
+import re
+import sys
+import time
+
+from text_normalize import clean_text, extract_and_clean
+
+
+# ---- Baseline: the implementations text_normalize replaced ----
+def legacy_clean_text(s):
+    if not s:
+        return ""
+    lines = [ln.strip() for ln in s.replace("\r\n", "\n").split("\n")]
+    out = []
+    prev_blank = False
+    for ln in lines:
+        is_blank = (ln == "")
+        if is_blank and prev_blank:
+            continue
+        out.append(ln)
+        prev_blank = is_blank
+    return "\n".join(out).strip()
+
+
+def legacy_extract_and_clean(raw_result):
+    out = {"post": "", "hashtags": [], "engagement": None}
+
+    if isinstance(raw_result, dict):
+        out["post"] = raw_result.get("post") or raw_result.get("text") or raw_result.get("content") or ""
+        tags = raw_result.get("hashtags", raw_result.get("tags", []))
+        if isinstance(tags, str):
+            out["hashtags"] = [t.strip() for t in tags.split(",") if t.strip()]
+        elif isinstance(tags, list):
+            out["hashtags"] = tags
+        out["engagement"] = raw_result.get("engagement", raw_result.get("score"))
+        out["tone"] = raw_result.get("tone", "")
+        out["model_id"] = raw_result.get("model_id", "")
+        if raw_result.get("error"):
+            out["error"] = True
+        return legacy_clean_text_output(out)
+
+    if isinstance(raw_result, str):
+        s = raw_result.strip()
+        try:
+            parsed = json.loads(s)
+            if isinstance(parsed, dict):
+                return legacy_extract_and_clean(parsed)
+        except Exception:
+            pass
+        try:
+            parsed = ast.literal_eval(s)
+            if isinstance(parsed, dict):
+                return legacy_extract_and_clean(parsed)
+        except Exception:
+            pass
+        try:
+            unescaped = bytes(s, "utf-8").decode("unicode_escape")
+        except Exception:
+            unescaped = s
+
+        if "{" in unescaped and "}" in unescaped:
+            start = unescaped.find("{")
+            end = unescaped.rfind("}") + 1
+            try:
+                parsed = json.loads(unescaped[start:end])
+                if isinstance(parsed, dict):
+                    return legacy_extract_and_clean(parsed)
+            except Exception:
+                pass
+
+        out["post"] = unescaped
+        return legacy_clean_text_output(out)
+
+    out["post"] = str(raw_result)
+    return legacy_clean_text_output(out)
+
+
+def legacy_clean_text_output(out):
+    post = out.get("post", "") or ""
+    post = post.replace("\\/", "/")
+    post = post.replace("\\n", "\n")
+    post = post.replace("\\", "")
+
+    post = re.sub(r'\.{3,}', '...', post)
+    post = re.sub(r'-{3,}', '---', post)
+    post = re.sub(r'\s{3,}', '  ', post)
+
+    post = post.replace("\r\n", "\n").replace("\r", "\n")
+    post = post.strip(" \n\r\t\"'")
+    safe = html.escape(post)
+
+    paragraphs = [p.strip() for p in safe.split("\n\n") if p.strip()]
+    if paragraphs:
+        html_paragraphs = "".join(
+            "<p style='margin:8px 0; line-height:1.6;'>{}</p>".format(p.replace("\n", ' '))
+            for p in paragraphs
+        )
+    else:
+        html_paragraphs = "<p style='margin:8px 0; line-height:1.6;'>{}</p>".format(safe)
+
+    out["post_html"] = html_paragraphs
+    tags = out.get("hashtags") or []
+    clean_tags = []
+    if isinstance(tags, str):
+        clean_tags = [t.strip() for t in tags.split(",") if t.strip()]
+    elif isinstance(tags, list):
+        for t in tags:
+            if isinstance(t, str):
+                clean_tags.append(t.strip())
+            else:
+                clean_tags.append(str(t))
+    out["hashtags"] = clean_tags
+    return out
+
+
+# ---- Workload ----
+WORDS = "team growth lesson career learning product launch customer feedback hiring mentor".split()
+
+
+def make_post(rng):
+    paragraphs = []
+    for _ in range(rng.randint(3, 6)):
+        sentence = " ".join(rng.choice(WORDS) for _ in range(rng.randint(15, 40)))
+        paragraphs.append("  " + sentence.capitalize() + "....  \r\n" + sentence + " ----")
+    return "\n\n\n\n".join(paragraphs)
+
+
+def make_batch(size, seed=7):
+    rng = random.Random(seed)
+    batch = []
+    for i in range(size):
+        post = make_post(rng)
+        record = {"post": post, "hashtags": ["#Growth ", "#Career"], "engagement": 1.5}
+        kind = i % 4
+        if kind < 2:
+            batch.append(record)  # what the generators return
+        elif kind == 2:
+            batch.append(json.dumps(record))  # serialized results
+        else:
+            batch.append(post)  # bare text
+    return batch
+
+
+def best_time(func, items, repeats):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for item in items:
+            func(item)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    batch = make_batch(size)
+    texts = [make_post(random.Random(i)) for i in range(size)]
+
+    # Same output on the workload before timing anything
+    for item in batch:
+        assert extract_and_clean(item) == legacy_extract_and_clean(item)
+    for text in texts:
+        assert clean_text(text) == legacy_clean_text(text)
+
+    rows = [
+        ("extract_and_clean (mixed)", legacy_extract_and_clean, extract_and_clean, batch),
+        ("extract_and_clean (dicts)", legacy_extract_and_clean, extract_and_clean,
+         [item for item in batch if isinstance(item, dict)]),
+        ("clean_text", legacy_clean_text, clean_text, texts),
+    ]
+    print(f"batch={size} repeats={repeats} (best run, seconds)")
+    print(f"{'case':<28}{'baseline':>10}{'new':>10}{'speedup':>9}")
+    for name, old, new, items in rows:
+        old_time = best_time(old, items, repeats)
+        new_time = best_time(new, items, repeats)
+        print(f"{name:<28}{old_time:>10.3f}{new_time:>10.3f}{old_time / new_time:>8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
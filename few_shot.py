@@ -1,44 +1,144 @@
 import pandas as pd
 import json
+import os
+import re
+import threading
+from collections import defaultdict
+from itertools import chain
+from typing import Optional
+
+from jsonl_io import is_jsonl, iter_records
+
+# Line-count buckets: < 5 lines is Short, 5-10 is Medium, more than 10 is Long
+LENGTH_BINS = [float("-inf"), 4, 10, float("inf")]
+LENGTH_LABELS = ["Short", "Medium", "Long"]
+
+DEFAULT_POSTS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "processed_posts.json")
+# Examples are trimmed so a few long posts cannot blow up the prompt
+MAX_EXAMPLE_CHARS = 600
+# Broken emoji in scraped posts can leave lone UTF-16 surrogates that cannot be sent as UTF-8
+_LONE_SURROGATES = re.compile(r"[\ud800-\udfff]")
 
 
 class FewShotPosts:
     def __init__(self, file_path="data/processed_posts.json"):
         self.df = None
         self.unique_tags = None
+        # (tag, language, length) -> row positions in self.df
+        self.index = None
         self.load_posts(file_path)
 
     def load_posts(self, file_path):
-        with open(file_path, encoding="utf-8") as f:
-            posts = json.load(f)
-            self.df = pd.json_normalize(posts)
-            self.df['length'] = self.df['line_count'].apply(self.categorize_length)
-            # collect unique tags
-            all_tags = self.df['tags'].apply(lambda x: x).sum()
-            self.unique_tags = list(set(all_tags))
+        if is_jsonl(file_path):
+            # Not pd.read_json: its parser rejects the lone surrogates scraped posts can contain
+            self.df = pd.json_normalize(list(iter_records(file_path)))
+        else:
+            with open(file_path, encoding="utf-8") as f:
+                posts = json.load(f)
+                self.df = pd.json_normalize(posts)
+        self.df['length'] = self.categorize_lengths(self.df['line_count'])
+        # collect unique tags
+        self.unique_tags = list(set(chain.from_iterable(self.df['tags'])))
+        self.build_index()
+
+    def build_index(self):
+        """Build the (tag, language, length) -> row positions index once per load."""
+        index = defaultdict(list)
+        rows = zip(self.df['tags'], self.df['language'], self.df['length'])
+        for position, (tags, language, length) in enumerate(rows):
+            for tag in set(tags):
+                index[(tag, language, length)].append(position)
+        self.index = dict(index)
 
     def get_filtered_posts(self, length, language, tag):
-        df_filtered = self.df[
-            (self.df['tags'].apply(lambda tags: tag in tags)) &  # Tags contain 'Influencer'
-            (self.df['language'] == language) &  # Language is 'English'
-            (self.df['length'] == length)  # Line count is less than 5
-        ]
-        return df_filtered.to_dict(orient='records')
+        positions = self.index.get((tag, language, length), [])
+        if not positions:
+            return []
+        return self.df.iloc[positions].to_dict(orient='records')
 
-    def categorize_length(self, line_count):
-        if line_count < 5:
-            return "Short"
-        elif 5 <= line_count <= 10:
-            return "Medium"
-        else:
-            return "Long"
+    @staticmethod
+    def categorize_lengths(line_counts):
+        """Map a Series of line counts to Short (<5 lines), Medium (5-10) or Long (>10)."""
+        return pd.cut(line_counts, bins=LENGTH_BINS, labels=LENGTH_LABELS).astype(str)
 
     def get_tags(self):
         return self.unique_tags
 
+    def get_examples(self, text, length, language, k=2):
+        """
+        Top-k example post texts for a generation request: posts in the same language
+        tagged with any tag mentioned in `text`, same length first, then highest engagement.
+        """
+        text_lower = text.lower()
+        tags = [tag for tag in self.unique_tags if tag.lower() in text_lower]
+        if not tags or k <= 0:
+            return []
+
+        same_length, other_length = [], []
+        for tag in tags:
+            for bucket in LENGTH_LABELS:
+                positions = self.index.get((tag, language, bucket), [])
+                (same_length if bucket == length else other_length).extend(positions)
+
+        engagement = self.df['engagement'] if 'engagement' in self.df else None
+        picked = []
+        for positions in (same_length, other_length):
+            unique_positions = list(dict.fromkeys(positions))
+            if engagement is not None:
+                unique_positions.sort(key=lambda pos: engagement.iat[pos], reverse=True)
+            for pos in unique_positions:
+                if pos not in picked:
+                    picked.append(pos)
+                if len(picked) >= k:
+                    break
+            if len(picked) >= k:
+                break
+
+        return [
+            _LONE_SURROGATES.sub("", str(self.df['text'].iat[pos]))[:MAX_EXAMPLE_CHARS]
+            for pos in picked
+        ]
+
+
+class FewShotStore:
+    """
+    Process-wide holder for a FewShotPosts index. Loads lazily on first use and
+    rebuilds only when the file's mtime changes, so requests never re-parse the JSON.
+    """
+
+    def __init__(self, file_path=DEFAULT_POSTS_PATH):
+        self.file_path = file_path
+        self._posts = None
+        self._mtime = None
+        self._lock = threading.Lock()
+
+    def get(self) -> Optional[FewShotPosts]:
+        try:
+            mtime = os.path.getmtime(self.file_path)
+        except OSError:
+            return None
+        if self._posts is None or mtime != self._mtime:
+            with self._lock:
+                if self._posts is None or mtime != self._mtime:
+                    self._posts = FewShotPosts(self.file_path)
+                    self._mtime = mtime
+        return self._posts
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_store(file_path=DEFAULT_POSTS_PATH) -> FewShotStore:
+    """Return the shared FewShotStore for a file."""
+    with _stores_lock:
+        if file_path not in _stores:
+            _stores[file_path] = FewShotStore(file_path)
+        return _stores[file_path]
+
 
 if __name__ == "__main__":
     fs = FewShotPosts()
     # print(fs.get_tags())
     posts = fs.get_filtered_posts("Medium","Hinglish","Job Search")
-    print(posts)
\ No newline at end of file
+    print(posts)
@@ -1,52 +1,257 @@
 """
 file_handler.py - Extract text content from uploaded files
-Supports: PDF, DOCX, PPTX, TXT
+Supports: PDF, DOCX, PPTX, TXT, MD, HTML, RTF (see register_extractor)
 """
 
 import io
-from typing import Optional, Dict
+import os
+import re
+import json
+from html.parser import HTMLParser
+import hashlib
+import threading
+import concurrent.futures
+from collections import OrderedDict
+from typing import BinaryIO, Callable, Optional, Dict, List, Union
 import PyPDF2
 from docx import Document
+from docx.table import Table
+from docx.text.paragraph import Paragraph
 from pptx import Presentation
 
+from disk_cache import DiskCache
+from summarizer import summarize
 
-def extract_text_from_pdf(file_bytes: bytes) -> str:
-    """Extract text from PDF file"""
+MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB in bytes
+# Characters of extracted text kept for prompt building
+MAX_CONTENT_CHARS = 5000
+TRUNCATION_NOTICE = "\n\n... (content truncated for processing)"
+# PDFs with at least this many pages are extracted page-parallel when the full text is needed
+PARALLEL_PDF_MIN_PAGES = 40
+# Leading pages checked for a text layer before extracting the rest of a PDF
+SCANNED_PDF_PROBE_PAGES = 3
+
+# Characters of file content sent in a file-based prompt (~500 tokens)
+PROMPT_CONTENT_CHARS = 2000
+
+# Keywords per content type, in tie-break order
+CONTENT_TYPE_KEYWORDS = {
+    "resume": ["resume", "cv", "experience", "education", "skills"],
+    "presentation": ["slide", "slides", "presentation", "agenda"],
+    "report": ["report", "analysis", "findings", "conclusion"],
+}
+_KEYWORD_TO_TYPE = {
+    keyword: content_type
+    for content_type, keywords in CONTENT_TYPE_KEYWORDS.items()
+    for keyword in keywords
+}
+_KEYWORD_WORD = re.compile(r"[a-z]+")
+
+# Extracted text by content hash: an in-process LRU, plus a disk tier shared across
+# processes and restarts when LINKGEN_EXTRACT_CACHE_DIR is set
+EXTRACT_CACHE_ENTRIES = 32
+_extract_cache: "OrderedDict[str, Dict[str, Optional[str]]]" = OrderedDict()
+_extract_cache_lock = threading.Lock()
+_extract_cache_dir = os.getenv("LINKGEN_EXTRACT_CACHE_DIR")
+extract_disk_cache = DiskCache(
+    os.path.join(_extract_cache_dir or ".cache", "extracted_text.sqlite3"),
+    ttl_seconds=float(os.getenv("LINKGEN_EXTRACT_CACHE_TTL_SECONDS", str(7 * 24 * 3600))),
+    enabled=bool(_extract_cache_dir),
+)
+
+# Extractors accept an open binary file (e.g. Streamlit's UploadedFile), bytes or a memoryview
+FileData = Union[BinaryIO, bytes, bytearray, memoryview]
+
+
+def _as_stream(data: FileData) -> BinaryIO:
+    """Readable binary stream positioned at the start, without copying streams passed in."""
+    if hasattr(data, "read"):
+        if hasattr(data, "seek"):
+            data.seek(0)
+        return data
+    return io.BytesIO(data)
+
+
+def _as_bytes(data: FileData) -> bytes:
+    if isinstance(data, bytes):
+        return data
+    if hasattr(data, "read"):
+        return _as_stream(data).read()
+    return bytes(data)
+
+
+def _file_size(uploaded_file) -> Optional[int]:
+    """Size from upload metadata or by seeking to the end; None if neither is available."""
+    size = getattr(uploaded_file, "size", None)
+    if size is not None:
+        return size
+    if hasattr(uploaded_file, "seekable") and uploaded_file.seekable():
+        position = uploaded_file.tell()
+        size = uploaded_file.seek(0, io.SEEK_END)
+        uploaded_file.seek(position)
+        return size
+    return None
+
+
+class ScannedPDFError(ValueError):
+    """The PDF's leading pages are images with no text layer."""
+
+
+# Extension -> (extractor, whether it takes a max_chars budget)
+EXTRACTORS: Dict[str, tuple] = {}
+
+
+def register_extractor(*extensions: str, budgeted: bool = False) -> Callable:
+    """
+    Register a text extractor for one or more file extensions (without the dot).
+    The extractor takes FileData, plus max_chars when budgeted=True, and returns text.
+    """
+    def decorator(func: Callable) -> Callable:
+        for extension in extensions:
+            EXTRACTORS[extension.lower()] = (func, budgeted)
+        return func
+    return decorator
+
+
+def supported_extensions() -> List[str]:
+    return sorted(EXTRACTORS)
+
+
+def _decode_text(file_data: FileData) -> str:
+    file_bytes = _as_bytes(file_data)
     try:
-        pdf_file = io.BytesIO(file_bytes)
-        pdf_reader = PyPDF2.PdfReader(pdf_file)
-        
+        return file_bytes.decode('utf-8')
+    except UnicodeDecodeError:
+        # latin-1 maps every byte, so this cannot fail
+        return file_bytes.decode('latin-1')
+
+
+def _page_has_images(page) -> bool:
+    try:
+        xobjects = page["/Resources"]["/XObject"].get_object()
+        return any(xobjects[name].get_object().get("/Subtype") == "/Image" for name in xobjects)
+    except (KeyError, TypeError, AttributeError):
+        return False
+
+
+def _check_text_layer(pdf_reader) -> List[str]:
+    """
+    Fail fast when the first pages have images but no extractable text.
+    Returns the texts of the pages it extracted (up to the first page with text),
+    so callers don't extract them twice.
+    """
+    probe = pdf_reader.pages[:SCANNED_PDF_PROBE_PAGES]
+    texts = []
+    for page in probe:
+        texts.append(page.extract_text() or "")
+        if texts[-1].strip():
+            return texts
+    if any(_page_has_images(page) for page in probe):
+        raise ScannedPDFError(
+            "This PDF appears to be scanned (image-only pages with no text layer). "
+            "Upload a text-based PDF or run OCR on it first."
+        )
+    return texts
+
+
+def _extract_pdf_page_range(file_bytes: bytes, start: int, stop: int) -> List[str]:
+    """Extract pages [start, stop) of a PDF. Module-level so process pools can pickle it."""
+    pdf_reader = PyPDF2.PdfReader(io.BytesIO(file_bytes))
+    return [pdf_reader.pages[page_num].extract_text() or "" for page_num in range(start, stop)]
+
+
+def extract_text_from_pdf_parallel(file_data: FileData, max_workers: Optional[int] = None) -> str:
+    """Extract every page of a PDF, splitting the pages across a process pool"""
+    try:
+        # Worker processes need their own copy of the document
+        file_bytes = _as_bytes(file_data)
+        page_count = len(PyPDF2.PdfReader(io.BytesIO(file_bytes)).pages)
+        max_workers = max_workers or os.cpu_count() or 1
+        # One contiguous range per worker, so each process parses the document only once
+        step = max(1, -(-page_count // max_workers))
+        ranges = [(start, min(start + step, page_count)) for start in range(0, page_count, step)]
+
+        with concurrent.futures.ProcessPoolExecutor(max_workers=len(ranges) or 1) as executor:
+            futures = [executor.submit(_extract_pdf_page_range, file_bytes, start, stop) for start, stop in ranges]
+            text_content = [text for future in futures for text in future.result()]
+
+        return "\n\n".join(text_content).strip()
+    except Exception as e:
+        raise ValueError(f"Error extracting PDF: {str(e)}")
+
+
+@register_extractor('pdf', budgeted=True)
+def extract_text_from_pdf(file_data: FileData, max_chars: Optional[int] = None) -> str:
+    """
+    Extract text from PDF file.
+    With max_chars, stops reading pages once that many characters are collected.
+    Without it, large documents are extracted page-parallel.
+    """
+    try:
+        pdf_reader = PyPDF2.PdfReader(_as_stream(file_data))
+        probed = _check_text_layer(pdf_reader)
+
+        if max_chars is None and len(pdf_reader.pages) >= PARALLEL_PDF_MIN_PAGES:
+            return extract_text_from_pdf_parallel(file_data)
+
         text_content = []
-        for page_num in range(len(pdf_reader.pages)):
-            page = pdf_reader.pages[page_num]
-            text_content.append(page.extract_text())
-        
+        collected = 0
+        for page_num, page in enumerate(pdf_reader.pages):
+            page_text = probed[page_num] if page_num < len(probed) else page.extract_text() or ""
+            text_content.append(page_text)
+            collected += len(page_text) + 2
+            if max_chars is not None and collected >= max_chars:
+                break
+
         return "\n\n".join(text_content).strip()
+    except ScannedPDFError:
+        raise
     except Exception as e:
         raise ValueError(f"Error extracting PDF: {str(e)}")
 
 
-def extract_text_from_docx(file_bytes: bytes) -> str:
-    """Extract text from DOCX file"""
+@register_extractor('docx')
+def extract_text_from_docx(file_data: FileData) -> str:
+    """Extract text from DOCX file, including tables (one row per line, cells split by |)"""
     try:
-        docx_file = io.BytesIO(file_bytes)
-        doc = Document(docx_file)
+        doc = Document(_as_stream(file_data))
         
         text_content = []
-        for paragraph in doc.paragraphs:
-            if paragraph.text.strip():
-                text_content.append(paragraph.text)
+        # Body order, so table text stays next to the headings around it
+        for element in doc.element.body.iterchildren():
+            if element.tag.endswith('}p'):
+                text = Paragraph(element, doc).text
+                if text.strip():
+                    text_content.append(text)
+            elif element.tag.endswith('}tbl'):
+                table_text = _docx_table_text(Table(element, doc))
+                if table_text:
+                    text_content.append(table_text)
         
         return "\n\n".join(text_content).strip()
     except Exception as e:
         raise ValueError(f"Error extracting DOCX: {str(e)}")
 
 
-def extract_text_from_pptx(file_bytes: bytes) -> str:
+def _docx_table_text(table: Table) -> str:
+    rows = []
+    for row in table.rows:
+        cells = []
+        for cell in row.cells:
+            text = " ".join(cell.text.split())
+            # Merged cells repeat across the span
+            if text and (not cells or cells[-1] != text):
+                cells.append(text)
+        if cells:
+            rows.append(" | ".join(cells))
+    return "\n".join(rows)
+
+
+@register_extractor('pptx')
+def extract_text_from_pptx(file_data: FileData) -> str:
     """Extract text from PPTX file"""
     try:
-        pptx_file = io.BytesIO(file_bytes)
-        prs = Presentation(pptx_file)
+        prs = Presentation(_as_stream(file_data))
         
         text_content = []
         for slide_num, slide in enumerate(prs.slides, 1):
@@ -61,16 +266,144 @@ def extract_text_from_pptx(file_bytes: bytes) -> str:
         raise ValueError(f"Error extracting PPTX: {str(e)}")
 
 
-def extract_text_from_txt(file_bytes: bytes) -> str:
+@register_extractor('txt', 'text')
+def extract_text_from_txt(file_data: FileData) -> str:
     """Extract text from TXT file"""
-    try:
-        return file_bytes.decode('utf-8').strip()
-    except UnicodeDecodeError:
-        # Try with different encoding
-        try:
-            return file_bytes.decode('latin-1').strip()
-        except Exception as e:
-            raise ValueError(f"Error reading TXT file: {str(e)}")
+    return _decode_text(file_data).strip()
+
+
+_MD_FENCE = re.compile(r"^\s*(```|~~~).*$", re.MULTILINE)
+_MD_IMAGE = re.compile(r"!\[([^\]]*)\]\([^)]*\)")
+_MD_LINK = re.compile(r"\[([^\]]+)\]\([^)]*\)")
+_MD_LINE_PREFIX = re.compile(r"^\s{0,3}(#{1,6}\s+|>\s?|[-*+]\s+(\[[ xX]\]\s+)?)", re.MULTILINE)
+# Emphasis runs must not be wedged between word characters, so snake_case_names and 2*3*4 survive
+_MD_EMPHASIS = re.compile(r"(?<!\w)(\*\*|__|\*|_)(?=\S)(.+?)(?<=\S)\1(?!\w)")
+_MD_CODE_STRIKE = re.compile(r"(~~|`)(?=\S)(.+?)(?<=\S)\1")
+_MD_RULE = re.compile(r"^\s*([-*_]\s*){3,}$", re.MULTILINE)
+_HTML_TAG = re.compile(r"<[^>]+>")
+
+
+@register_extractor('md', 'markdown')
+def extract_text_from_md(file_data: FileData) -> str:
+    """Extract text from Markdown, dropping the markup but keeping link and image text"""
+    text = _decode_text(file_data)
+    text = _MD_FENCE.sub("", text)
+    text = _MD_IMAGE.sub(r"\1", text)
+    text = _MD_LINK.sub(r"\1", text)
+    text = _MD_RULE.sub("", text)
+    text = _MD_LINE_PREFIX.sub("", text)
+    text = _MD_EMPHASIS.sub(r"\2", text)
+    text = _MD_CODE_STRIKE.sub(r"\2", text)
+    text = _HTML_TAG.sub("", text)
+    return re.sub(r"\n{3,}", "\n\n", text).strip()
+
+
+class _HTMLTextParser(HTMLParser):
+    """Collects visible text; block-level tags become line breaks."""
+
+    SKIP_TAGS = {"script", "style", "noscript", "template", "head"}
+    BLOCK_TAGS = {
+        "p", "div", "br", "li", "tr", "h1", "h2", "h3", "h4", "h5", "h6",
+        "section", "article", "header", "footer", "blockquote", "pre", "table", "ul", "ol",
+    }
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts = []
+        self._skip_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.SKIP_TAGS:
+            self._skip_depth += 1
+        elif tag in self.BLOCK_TAGS:
+            self.parts.append("\n")
+        elif tag in ("td", "th"):
+            self.parts.append(" | ")
+
+    def handle_endtag(self, tag):
+        if tag in self.SKIP_TAGS:
+            self._skip_depth = max(0, self._skip_depth - 1)
+        elif tag in self.BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def handle_data(self, data):
+        if not self._skip_depth:
+            self.parts.append(data)
+
+
+@register_extractor('html', 'htm')
+def extract_text_from_html(file_data: FileData) -> str:
+    """Extract visible text from HTML"""
+    parser = _HTMLTextParser()
+    parser.feed(_decode_text(file_data))
+    parser.close()
+    lines = (" ".join(line.split()).strip(" |") for line in "".join(parser.parts).splitlines())
+    return "\n".join(line for line in lines if line)
+
+
+_RTF_TOKEN = re.compile(r"\\([a-z]{1,32})(-?\d{1,10})? ?|\\'([0-9a-f]{2})|\\([^a-z])|([{}])|[\r\n]+|(.)", re.I)
+# Destinations whose contents are formatting data, not document text
+_RTF_SKIP_DESTINATIONS = {
+    "fonttbl", "colortbl", "stylesheet", "info", "pict", "header", "footer",
+    "listtable", "listoverridetable", "rsidtbl", "themedata", "datastore", "latentstyles",
+    "xmlnstbl", "generator", "object", "fldinst", "filetbl", "revtbl", "operator",
+}
+_RTF_SPECIAL = {"par": "\n", "line": "\n", "sect": "\n\n", "page": "\n\n", "tab": "\t", "cell": " | ", "row": "\n",
+                "emdash": "\u2014", "endash": "\u2013", "bullet": "\u2022",
+                "lquote": "\u2018", "rquote": "\u2019", "ldblquote": "\u201c", "rdblquote": "\u201d"}
+
+
+@register_extractor('rtf')
+def extract_text_from_rtf(file_data: FileData) -> str:
+    """Extract text from RTF by walking its control words (no external parser needed)"""
+    text = _decode_text(file_data)
+    stack = []
+    skip = False
+    unicode_skip = 1
+    pending_skip = 0
+    out = []
+    for match in _RTF_TOKEN.finditer(text):
+        word, arg, hex_code, symbol, brace, char = match.groups()
+        if brace == "{":
+            stack.append((skip, unicode_skip))
+            continue
+        if brace == "}":
+            if stack:
+                skip, unicode_skip = stack.pop()
+            continue
+        if pending_skip and (char or hex_code):
+            pending_skip -= 1
+            continue
+        if symbol:
+            if symbol == "*":
+                skip = True
+            elif symbol in "{}\\":
+                if not skip:
+                    out.append(symbol)
+            elif symbol == "~" and not skip:
+                out.append("\u00a0")
+            continue
+        if word:
+            word = word.lower()
+            if word in _RTF_SKIP_DESTINATIONS:
+                skip = True
+            elif word == "uc":
+                unicode_skip = int(arg or 1)
+            elif word == "u" and arg is not None:
+                if not skip:
+                    code = int(arg)
+                    out.append(chr(code + 65536 if code < 0 else code))
+                pending_skip = unicode_skip
+            elif not skip and word in _RTF_SPECIAL:
+                out.append(_RTF_SPECIAL[word])
+            continue
+        if skip:
+            continue
+        if hex_code:
+            out.append(bytes([int(hex_code, 16)]).decode("cp1252", errors="replace"))
+        elif char:
+            out.append(char)
+    return re.sub(r"\n{3,}", "\n\n", "".join(out)).strip()
 
 
 def process_uploaded_file(uploaded_file) -> Dict[str, str]:
@@ -91,36 +424,27 @@ def process_uploaded_file(uploaded_file) -> Dict[str, str]:
     }
     
     try:
-        file_bytes = uploaded_file.read()
         file_extension = uploaded_file.name.lower().split('.')[-1]
         
-        # Check file size (max 10MB)
-        max_size = 10 * 1024 * 1024  # 10MB in bytes
-        if len(file_bytes) > max_size:
-            result["error"] = "File size exceeds 10MB limit"
-            return result
-        
-        # Extract text based on file type
-        if file_extension == 'pdf':
-            result["content"] = extract_text_from_pdf(file_bytes)
-        elif file_extension == 'docx':
-            result["content"] = extract_text_from_docx(file_bytes)
-        elif file_extension == 'pptx':
-            result["content"] = extract_text_from_pptx(file_bytes)
-        elif file_extension in ['txt', 'text']:
-            result["content"] = extract_text_from_txt(file_bytes)
+        # Check file size (max 10MB) before reading anything
+        size = _file_size(uploaded_file)
+        if size is None:
+            # Unknown size: read at most one byte past the limit
+            file_data = uploaded_file.read(MAX_FILE_SIZE + 1)
+            size = len(file_data)
         else:
-            result["error"] = f"Unsupported file type: .{file_extension}"
-            return result
-        
-        # Check if content was extracted
-        if not result["content"]:
-            result["error"] = "No text content found in file"
+            file_data = uploaded_file
+        if size > MAX_FILE_SIZE:
+            result["error"] = "File size exceeds 10MB limit"
             return result
         
-        # Limit content length (max 5000 chars for processing)
-        if len(result["content"]) > 5000:
-            result["content"] = result["content"][:5000] + "\n\n... (content truncated for processing)"
+        # Streamlit reruns the script on every interaction; parse each document once
+        cache_key = f"{_content_hash(file_data)}:{file_extension}:{MAX_CONTENT_CHARS}"
+        extracted = _cached_extraction(cache_key)
+        if extracted is None:
+            extracted = _extract_content(file_data, file_extension)
+            _store_extraction(cache_key, extracted)
+        result.update(extracted)
         
     except Exception as e:
         result["error"] = f"Error processing file: {str(e)}"
@@ -128,6 +452,91 @@ def process_uploaded_file(uploaded_file) -> Dict[str, str]:
     return result
 
 
+def _extract_content(file_data: FileData, file_extension: str) -> Dict[str, Optional[str]]:
+    """Extract and trim the text of one file. Returns {'content', 'error'}."""
+    extracted = {"content": "", "error": None}
+
+    # Extract text based on file type
+    if file_extension not in EXTRACTORS:
+        extracted["error"] = f"Unsupported file type: .{file_extension}"
+        return extracted
+    extractor, budgeted = EXTRACTORS[file_extension]
+    try:
+        if budgeted:
+            # One extra char so the truncation notice below still triggers
+            extracted["content"] = extractor(file_data, max_chars=MAX_CONTENT_CHARS + 1)
+        else:
+            extracted["content"] = extractor(file_data)
+    except ScannedPDFError as e:
+        extracted["error"] = str(e)
+        return extracted
+
+    # Check if content was extracted
+    if not extracted["content"]:
+        extracted["error"] = "No text content found in file"
+        return extracted
+
+    # Limit content length (max 5000 chars for processing)
+    if len(extracted["content"]) > MAX_CONTENT_CHARS:
+        extracted["content"] = extracted["content"][:MAX_CONTENT_CHARS] + TRUNCATION_NOTICE
+
+    return extracted
+
+
+def _content_hash(file_data: FileData) -> str:
+    """SHA-256 of the file contents, streamed so the file is not copied."""
+    if hasattr(file_data, "read"):
+        # Plain read loop rather than hashlib.file_digest, which rejects file-like wrappers
+        stream = _as_stream(file_data)
+        digest = hashlib.sha256()
+        for chunk in iter(lambda: stream.read(1 << 20), b""):
+            digest.update(chunk)
+        stream.seek(0)
+        return digest.hexdigest()
+    return hashlib.sha256(file_data).hexdigest()
+
+
+def _cached_extraction(key: str) -> Optional[Dict[str, Optional[str]]]:
+    with _extract_cache_lock:
+        if key in _extract_cache:
+            _extract_cache.move_to_end(key)
+            return dict(_extract_cache[key])
+    cached = extract_disk_cache.get(key)
+    if cached is None:
+        return None
+    extracted = json.loads(cached)
+    _remember_extraction(key, extracted)
+    return dict(extracted)
+
+
+def _store_extraction(key: str, extracted: Dict[str, Optional[str]]) -> None:
+    _remember_extraction(key, extracted)
+    extract_disk_cache.set(key, json.dumps(extracted))
+
+
+def _remember_extraction(key: str, extracted: Dict[str, Optional[str]]) -> None:
+    with _extract_cache_lock:
+        _extract_cache[key] = dict(extracted)
+        _extract_cache.move_to_end(key)
+        while len(_extract_cache) > EXTRACT_CACHE_ENTRIES:
+            _extract_cache.popitem(last=False)
+
+
+def classify_content(file_content: str) -> str:
+    """
+    Classify a document as resume, presentation, report or document from its
+    keywords in one pass over its words. The type with the most hits wins;
+    ties go to the earlier type in CONTENT_TYPE_KEYWORDS.
+    """
+    hits = dict.fromkeys(CONTENT_TYPE_KEYWORDS, 0)
+    for word in _KEYWORD_WORD.findall(file_content.lower()):
+        content_type = _KEYWORD_TO_TYPE.get(word)
+        if content_type is not None:
+            hits[content_type] += 1
+    best = max(hits, key=hits.get)
+    return best if hits[best] else "document"
+
+
 def create_file_based_prompt(file_content: str, file_type: str) -> str:
     """
     Create a contextual prompt based on file type
@@ -141,16 +550,9 @@ def create_file_based_prompt(file_content: str, file_type: str) -> str:
     """
     
     # Detect content type
-    content_lower = file_content.lower()
-    
-    if any(keyword in content_lower for keyword in ['resume', 'cv', 'experience', 'education', 'skills']):
-        prompt_type = "resume"
-    elif any(keyword in content_lower for keyword in ['slide', 'presentation', 'agenda']):
-        prompt_type = "presentation"
-    elif any(keyword in content_lower for keyword in ['report', 'analysis', 'findings', 'conclusion']):
-        prompt_type = "report"
-    else:
-        prompt_type = "document"
+    prompt_type = classify_content(file_content)
+    # Densest sentences within the budget rather than a blind prefix
+    file_content = summarize(file_content.removesuffix(TRUNCATION_NOTICE), PROMPT_CONTENT_CHARS)
     
     # Create contextual prompts
     prompts = {
@@ -159,28 +561,28 @@ def create_file_based_prompt(file_content: str, file_type: str) -> str:
             f"- Key achievements and skills\n"
             f"- Career progression or milestones\n"
             f"- Professional value proposition\n\n"
-            f"Content:\n{file_content[:2000]}"
+            f"Content:\n{file_content}"
         ),
         "presentation": (
             f"Based on this presentation, create a LinkedIn post that:\n"
             f"- Summarizes the key insights\n"
             f"- Highlights main takeaways\n"
             f"- Engages the audience with the core message\n\n"
-            f"Content:\n{file_content[:2000]}"
+            f"Content:\n{file_content}"
         ),
         "report": (
             f"Based on this report, create a LinkedIn post that:\n"
             f"- Shares the most important findings\n"
             f"- Provides actionable insights\n"
             f"- Invites professional discussion\n\n"
-            f"Content:\n{file_content[:2000]}"
+            f"Content:\n{file_content}"
         ),
         "document": (
             f"Based on this document, create an engaging LinkedIn post that:\n"
             f"- Captures the main ideas\n"
             f"- Adds professional context\n"
             f"- Encourages meaningful engagement\n\n"
-            f"Content:\n{file_content[:2000]}"
+            f"Content:\n{file_content}"
         )
     }
     
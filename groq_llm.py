@@ -1,7 +1,17 @@
 import os
-from typing import Optional, Tuple
+import re
+import asyncio
+import hashlib
+import json
+import weakref
+from typing import Any, Dict, Generator, Optional, Tuple
 from dotenv import load_dotenv
-from groq import Groq
+from groq import Groq, AsyncGroq, RateLimitError
+
+from disk_cache import DiskCache
+from rate_limiter import RateLimiter, limiter_for
+from singleflight import SingleFlight
+from text_normalize import clean_text
 
 load_dotenv()
 
@@ -12,67 +22,464 @@ if not GROQ_API_KEY:
 # IMPORTANT: do NOT pass unsupported kwargs (like proxies)
 client = Groq()
 
+# AsyncGroq pools its connections on the event loop that first uses them,
+# so keep one async client per loop instead of a single module-level one.
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncGroq]" = (
+    weakref.WeakKeyDictionary()
+)
 
-def _clean_text(s: str) -> str:
-    """Trim, collapse excessive blank lines/spaces."""
-    if not s:
-        return ""
-    # Normalize Windows newlines, strip leading/trailing spaces per line, collapse blank lines
-    lines = [ln.strip() for ln in s.replace("\r\n", "\n").split("\n")]
-    # Remove consecutive empty lines
-    out = []
-    prev_blank = False
-    for ln in lines:
-        is_blank = (ln == "")
-        if is_blank and prev_blank:
-            continue
-        out.append(ln)
-        prev_blank = is_blank
-    return "\n".join(out).strip()
 
+def get_async_client() -> AsyncGroq:
+    """Return the AsyncGroq client bound to the running event loop."""
+    loop = asyncio.get_running_loop()
+    async_client = _async_clients.get(loop)
+    if async_client is None:
+        async_client = AsyncGroq()
+        _async_clients[loop] = async_client
+    return async_client
 
-def build_prompt(
-    topic: str,
-    length_label: str,
-    language: str,
-    custom_prompt: Optional[str] = None,
-    tone: str = "professional",
-) -> str:
+
+# Model registry: each comparison variant maps to a real Groq model id with its
+# own sampling defaults plus rough cost (USD per 1M tokens) and latency metadata.
+# max_tokens is the per-model ceiling; posts get a tighter length-aware budget.
+MODEL_REGISTRY: Dict[str, Dict[str, Any]] = {
+    "Llama-3.1-8B": {
+        "model": "llama-3.1-8b-instant",
+        "temperature": 0.6,
+        "max_tokens": 4096,
+        "input_cost_per_mtok": 0.05,
+        "output_cost_per_mtok": 0.08,
+        "latency": "fast",
+        "description": "Small, fast model; good default and for latency-sensitive calls.",
+    },
+    "Llama-3.3-70B": {
+        "model": "llama-3.3-70b-versatile",
+        "temperature": 0.7,
+        "max_tokens": 4096,
+        "input_cost_per_mtok": 0.59,
+        "output_cost_per_mtok": 0.79,
+        "latency": "medium",
+        "description": "Large model; richer phrasing and more nuance.",
+    },
+    "Llama-4-Scout": {
+        "model": "meta-llama/llama-4-scout-17b-16e-instruct",
+        "temperature": 0.7,
+        "max_tokens": 4096,
+        "input_cost_per_mtok": 0.11,
+        "output_cost_per_mtok": 0.34,
+        "latency": "fast",
+        "description": "Mixture-of-experts model; quality close to 70B at lower cost.",
+    },
+}
+
+# Registry keys used when the caller does not pick a model
+DEFAULT_MODEL = os.getenv("LINKGEN_DEFAULT_MODEL", "Llama-3.1-8B")
+# Hashtags are short and latency-sensitive, so they always go to a cheap fast model
+HASHTAG_MODEL = os.getenv("LINKGEN_HASHTAG_MODEL", "Llama-3.1-8B")
+
+
+def get_model_spec(model: Optional[str] = None) -> Dict[str, Any]:
     """
-    Strict prompt: forces the model to use the user's custom text if provided,
-    and generate natively in the selected language (not translating from English first).
+    Resolve a registry key (e.g. "Llama-3.3-70B") or a raw Groq model id into a spec dict.
+    Unknown ids get the default model's sampling settings.
     """
+    name = model or DEFAULT_MODEL
+    if name in MODEL_REGISTRY:
+        return dict(MODEL_REGISTRY[name], name=name)
+    for key, spec in MODEL_REGISTRY.items():
+        if spec["model"] == name:
+            return dict(spec, name=key)
+    fallback = MODEL_REGISTRY.get(DEFAULT_MODEL, MODEL_REGISTRY["Llama-3.1-8B"])
+    return dict(fallback, name=name, model=name)
+
+
+def estimate_cost(model: Optional[str], input_tokens: int, output_tokens: int) -> float:
+    """Approximate USD cost of a call from the registry's per-token prices."""
+    spec = get_model_spec(model)
+    return (
+        input_tokens * spec["input_cost_per_mtok"] + output_tokens * spec["output_cost_per_mtok"]
+    ) / 1_000_000
+
+
+# Identical (model, prompt, temperature, seed) requests are served from disk.
+# Set LINKGEN_CACHE_DISABLE=1 to bypass globally, or pass use_cache=False per call.
+response_cache = DiskCache(
+    os.getenv("LINKGEN_CACHE_PATH", os.path.join(".cache", "llm_responses.sqlite3")),
+    ttl_seconds=float(os.getenv("LINKGEN_CACHE_TTL_SECONDS", str(24 * 3600))),
+    max_bytes=int(os.getenv("LINKGEN_CACHE_MAX_BYTES", str(50 * 1024 * 1024))),
+    enabled=os.getenv("LINKGEN_CACHE_DISABLE", "").lower() not in ("1", "true", "yes"),
+)
+
+
+# Concurrent identical cacheable completions (same key as response_cache) share one
+# upstream call, e.g. the hashtag call each parallel tone variant makes for the same topic.
+inflight = SingleFlight()
+
+
+def _cache_key(
+    model: str,
+    prompt: str,
+    temperature: float,
+    seed: Optional[int],
+    json_mode: bool = False,
+    max_tokens: Optional[int] = None,
+    stop: Optional[list] = None,
+) -> str:
+    # surrogatepass: scraped posts and pasted topics can contain lone surrogates from broken emoji
+    prompt_hash = hashlib.sha256(prompt.encode("utf-8", "surrogatepass")).hexdigest()
+    stop_part = hashlib.sha256(json.dumps(stop).encode("utf-8")).hexdigest()[:12] if stop else ""
+    return (
+        f"{model}|{prompt_hash}|{temperature}|{seed}|{max_tokens}|{stop_part}"
+        + ("|json" if json_mode else "")
+    )
+
+
+# Lone UTF-16 surrogates cannot be encoded as UTF-8, so they are dropped before sending
+_LONE_SURROGATES = re.compile(r"[\ud800-\udfff]")
 
-    length_map = {
-        "Short": "30-60 words",
-        "Medium": "120-160 words",
-        "Long": "220-320 words",
+
+def _completion_kwargs(
+    model: str,
+    prompt: str,
+    temperature: float,
+    seed: Optional[int],
+    json_mode: bool = False,
+    max_tokens: Optional[int] = None,
+    stop: Optional[list] = None,
+    messages: Optional[list] = None,
+) -> dict:
+    messages = messages or [{"role": "user", "content": prompt}]
+    kwargs = {
+        "model": model,
+        "messages": [
+            dict(message, content=_LONE_SURROGATES.sub("", message["content"]))
+            if isinstance(message.get("content"), str) else message
+            for message in messages
+        ],
+        "temperature": temperature,
     }
-    word_range = length_map.get(length_label, "120-160 words")
+    if stop:
+        kwargs["stop"] = stop
+    if max_tokens is not None:
+        kwargs["max_tokens"] = max_tokens
+    if seed is not None:
+        kwargs["seed"] = seed
+    if json_mode:
+        kwargs["response_format"] = {"type": "json_object"}
+    return kwargs
+
+
+def _message_content(response) -> Optional[str]:
+    try:
+        return response.choices[0].message.content
+    except Exception:
+        return None
+
+
+def _finish_reason(response) -> Optional[str]:
+    try:
+        return response.choices[0].finish_reason
+    except Exception:
+        return None
+
+
+def _cacheable(text: str, reason: Optional[str], json_mode: bool) -> bool:
+    """JSON-mode completions cut off at max_tokens or not valid JSON would fail again on every cache hit."""
+    if not json_mode:
+        return True
+    if reason == "length":
+        return False
+    try:
+        json.loads(text)
+    except ValueError:
+        return False
+    return True
+
+
+def _decode_cached(value: str) -> Tuple[str, Optional[str]]:
+    """Cached values are JSON [text, finish_reason]; plain strings predate that."""
+    try:
+        text, reason = json.loads(value)
+        return text, reason
+    except (ValueError, TypeError):
+        return value, None
+
+
+# Completion budget assumed when reserving tokens-per-minute for a request
+DEFAULT_COMPLETION_TOKENS = 400
+# Extra attempts after a 429 once the SDK's own retries are exhausted
+RATE_LIMIT_RETRIES = 2
+
+
+def _estimate_tokens(prompt: str, completion_tokens: int = DEFAULT_COMPLETION_TOKENS) -> int:
+    """Rough prompt + completion size (~4 chars per token) for the TPM budget."""
+    return len(prompt) // 4 + completion_tokens
+
+
+def _rate_limit_backoff(limiter: RateLimiter, err: RateLimitError, attempt: int) -> None:
+    headers = getattr(getattr(err, "response", None), "headers", None)
+    limiter.update_from_headers(headers)
+    if not headers or "retry-after" not in headers:
+        limiter.block_for(2.0 * (attempt + 1))
+
+
+def _settle_usage(kwargs: dict, prompt: str, usage) -> None:
+    """Refund the unused part of the request's token reservation once its real usage is known."""
+    total = getattr(usage, "total_tokens", None)
+    if total is not None:
+        limiter_for(kwargs["model"]).settle(
+            _estimate_tokens(prompt, kwargs.get("max_tokens", DEFAULT_COMPLETION_TOKENS)), total
+        )
+
+
+def _send(kwargs: dict, prompt: str):
+    """Send one request through the model's shared limiter, retrying 429s. Returns the parsed response."""
+    limiter = limiter_for(kwargs["model"])
+    for attempt in range(RATE_LIMIT_RETRIES + 1):
+        limiter.acquire(_estimate_tokens(prompt, kwargs.get("max_tokens", DEFAULT_COMPLETION_TOKENS)))
+        try:
+            raw_response = client.chat.completions.with_raw_response.create(**kwargs)
+            break
+        except RateLimitError as e:
+            if attempt == RATE_LIMIT_RETRIES:
+                raise
+            _rate_limit_backoff(limiter, e, attempt)
+    response = raw_response.parse()
+    # Streams report usage in their last chunk; stream_groq_post settles those
+    if not kwargs.get("stream"):
+        _settle_usage(kwargs, prompt, getattr(response, "usage", None))
+    limiter.update_from_headers(raw_response.headers)
+    return response
 
-    lang_instruction = ""
+
+async def _asend(kwargs: dict, prompt: str):
+    """Async counterpart of _send."""
+    limiter = limiter_for(kwargs["model"])
+    for attempt in range(RATE_LIMIT_RETRIES + 1):
+        await limiter.aacquire(_estimate_tokens(prompt, kwargs.get("max_tokens", DEFAULT_COMPLETION_TOKENS)))
+        try:
+            raw_response = await get_async_client().chat.completions.with_raw_response.create(**kwargs)
+            break
+        except RateLimitError as e:
+            if attempt == RATE_LIMIT_RETRIES:
+                raise
+            _rate_limit_backoff(limiter, e, attempt)
+    response = await raw_response.parse()
+    _settle_usage(kwargs, prompt, getattr(response, "usage", None))
+    limiter.update_from_headers(raw_response.headers)
+    return response
+
+
+def _complete_with_reason(
+    prompt: str,
+    model: str,
+    temperature: float,
+    seed: Optional[int] = None,
+    use_cache: bool = True,
+    json_mode: bool = False,
+    max_tokens: Optional[int] = None,
+    stop: Optional[list] = None,
+    messages: Optional[list] = None,
+) -> Tuple[str, Optional[str]]:
+    """
+    Single chat completion, served from response_cache when possible; identical
+    calls already in flight in other threads are joined rather than repeated.
+    Returns (text, finish_reason). Pass messages for multi-turn calls; prompt
+    is then only used as cache/rate-limit material.
+    """
+    key = _cache_key(model, prompt, temperature, seed, json_mode, max_tokens, stop)
+
+    def fetch() -> Tuple[str, Optional[str]]:
+        if use_cache:
+            cached = response_cache.get(key)
+            if cached is not None:
+                return _decode_cached(cached)
+
+        response = _send(
+            _completion_kwargs(model, prompt, temperature, seed, json_mode, max_tokens, stop, messages), prompt
+        )
+        text = _message_content(response)
+        reason = _finish_reason(response)
+        if not text:
+            return "", reason
+        if use_cache and _cacheable(text, reason, json_mode):
+            response_cache.set(key, json.dumps([text, reason]))
+        return text, reason
+
+    # use_cache=False asks for a fresh completion, so it never shares another caller's
+    return inflight.do(key, fetch) if use_cache else fetch()
+
+
+async def _acomplete_with_reason(
+    prompt: str,
+    model: str,
+    temperature: float,
+    seed: Optional[int] = None,
+    use_cache: bool = True,
+    json_mode: bool = False,
+    max_tokens: Optional[int] = None,
+    stop: Optional[list] = None,
+    messages: Optional[list] = None,
+) -> Tuple[str, Optional[str]]:
+    """Async counterpart of _complete_with_reason."""
+    key = _cache_key(model, prompt, temperature, seed, json_mode, max_tokens, stop)
+
+    async def fetch() -> Tuple[str, Optional[str]]:
+        if use_cache:
+            cached = await asyncio.to_thread(response_cache.get, key)
+            if cached is not None:
+                return _decode_cached(cached)
+
+        response = await _asend(
+            _completion_kwargs(model, prompt, temperature, seed, json_mode, max_tokens, stop, messages), prompt
+        )
+        text = _message_content(response)
+        reason = _finish_reason(response)
+        if not text:
+            return "", reason
+        if use_cache and _cacheable(text, reason, json_mode):
+            await asyncio.to_thread(response_cache.set, key, json.dumps([text, reason]))
+        return text, reason
+
+    return await inflight.ado(key, fetch) if use_cache else await fetch()
+
+
+def complete(prompt: str, model: str, temperature: float, **kwargs) -> str:
+    """
+    Text of a single chat completion for a raw Groq model id, paced by the rate
+    limiter and served from response_cache when possible. Accepts seed,
+    use_cache, json_mode, max_tokens and stop. Returns "" for an empty reply.
+    """
+    return _complete_with_reason(prompt, model, temperature, **kwargs)[0]
+
+
+async def acomplete(prompt: str, model: str, temperature: float, **kwargs) -> str:
+    """Async counterpart of complete."""
+    return (await _acomplete_with_reason(prompt, model, temperature, **kwargs))[0]
+
+
+LENGTH_WORD_RANGES = {
+    "Short": "30-60 words",
+    "Medium": "120-160 words",
+    "Long": "220-320 words",
+}
+
+# Approximate tokens per word by output language (Indic scripts split into many more tokens)
+LANGUAGE_TOKENS_PER_WORD = {
+    "english": 1.4,
+    "hindi": 4.0,
+    "kannada": 6.0,
+}
+# Headroom over the upper word bound so a post that runs a little long is not cut off
+TOKEN_BUDGET_HEADROOM = 1.5
+
+# The post is returned without hashtags, so anything after these is discarded server-side
+POST_STOP_SEQUENCES = ["\n\n#", "\nHashtags:", "USER_PROMPT_START"]
+
+
+def compute_max_tokens(length_label: str, language: str) -> int:
+    """Token budget for one post: upper word bound x tokens-per-word x headroom."""
+    word_range = LENGTH_WORD_RANGES.get(length_label, "120-160 words")
+    upper_words = int(re.findall(r"\d+", word_range)[-1])
+    per_word = LANGUAGE_TOKENS_PER_WORD.get(language.lower(), 2.0)
+    return int(upper_words * per_word * TOKEN_BUDGET_HEADROOM) + 32
+
+
+def multi_tone_budget(length_label: str, language: str, tone_count: int, model: Optional[str] = None) -> Optional[int]:
+    """
+    Token budget for one JSON response holding tone_count posts, or None when it
+    does not fit under the model's max_tokens ceiling (generate one request per tone then).
+    """
+    budget = compute_max_tokens(length_label, language) * tone_count + 64
+    return budget if budget <= get_model_spec(model)["max_tokens"] else None
+
+
+def _continuation_messages(prompt: str, partial: str) -> list:
+    return [
+        {"role": "user", "content": prompt},
+        {"role": "assistant", "content": partial},
+        {
+            "role": "user",
+            "content": (
+                "You were cut off. Continue the post exactly where it stopped and finish it concisely. "
+                "Do not repeat earlier text. Return ONLY the continuation."
+            ),
+        },
+    ]
+
+
+def _join_continuation(partial: str, continuation: str) -> str:
+    if not continuation:
+        return partial
+    if partial[-1:].isspace() or continuation[:1] in " \n.,;:!?":
+        return partial + continuation
+    return partial + " " + continuation
+
+
+def trim_to_sentence(text: str) -> str:
+    """Drop the dangling half-sentence left by a max_tokens cut-off."""
+    cut = max(text.rfind(ch) for ch in ".!?।\n")
+    # Keep the text as-is if trimming would throw away most of it
+    if cut < len(text) // 5:
+        return text
+    return text[: cut + 1]
+
+
+def _language_instruction(language: str) -> str:
     lang_lower = language.lower()
     if lang_lower == "english":
-        lang_instruction = "Write the post in natural, native English."
+        return "Write the post in natural, native English."
     elif lang_lower == "hindi":
-        lang_instruction = (
+        return (
             "पोस्ट को स्वाभाविक, प्रामाणिक हिंदी में लिखें। शुरुआत से हिंदी में लिखें; अंग्रेज़ी से अनुवाद न करें।"
         )
     elif lang_lower == "kannada":
-        lang_instruction = (
+        return (
             "ಪೋಸ್ಟ್ ಅನ್ನು ಸ್ವಾಭಾವಿಕ, ಶುದ್ಧ ಕನ್ನಡದಲ್ಲಿ ಬರೆಯಿರಿ. ಪ್ರಾರಂಭದಿಂದಲೇ ಕನ್ನಡದಲ್ಲಿ ರಚಿಸಿ; ಇಂಗ್ಲಿಷ್‌ನಿಂದ ಅನುವಾದಿಸಬೇಡಿ."
         )
-    else:
-        lang_instruction = f"Write the post in {language}."
+    return f"Write the post in {language}."
+
+
+def _examples_fragment(examples: Optional[list]) -> str:
+    if not examples:
+        return ""
+    blocks = "".join(
+        f"EXAMPLE {i}:\n{example.strip()}\n\n" for i, example in enumerate(examples, 1)
+    )
+    return (
+        "Example posts from our curated library. Match their voice and formatting, "
+        "but do NOT copy their content:\n\n" + blocks
+    )
 
-    user_fragment = ""
+
+def _user_fragment(custom_prompt: Optional[str]) -> str:
     if custom_prompt and custom_prompt.strip():
         snippet = custom_prompt.strip()
-        user_fragment = (
+        return (
             "\nIMPORTANT: Incorporate the following user instruction as the main focus. "
             "Do NOT ignore it. Use the exact context to guide the content.\n"
             f"USER_PROMPT_START\n{snippet}\nUSER_PROMPT_END\n"
         )
+    return ""
+
+
+def build_prompt(
+    topic: str,
+    length_label: str,
+    language: str,
+    custom_prompt: Optional[str] = None,
+    tone: str = "professional",
+    examples: Optional[list] = None,
+) -> str:
+    """
+    Strict prompt: forces the model to use the user's custom text if provided,
+    and generate natively in the selected language (not translating from English first).
+    examples are optional few-shot post texts (see few_shot.FewShotPosts.get_examples).
+    """
+
+    word_range = LENGTH_WORD_RANGES.get(length_label, "120-160 words")
+    lang_instruction = _language_instruction(language)
+    user_fragment = _user_fragment(custom_prompt)
 
     # Note: No backslashes inside f-strings; plain string concatenation to avoid syntax issues.
     prompt = (
@@ -89,7 +496,8 @@ def build_prompt(
         "- Use clean line breaks and simple bullets.\n"
         "- Sound human and professional; avoid robotic phrasing.\n"
         "- DO NOT include hashtags (they will be generated separately).\n\n"
-        "Return ONLY the post text, no extra commentary, no JSON.\n"
+        + _examples_fragment(examples)
+        + "Return ONLY the post text, no extra commentary, no JSON.\n"
         + user_fragment
     )
     return prompt
@@ -102,38 +510,262 @@ def generate_groq_post(
     custom_prompt: Optional[str] = None,
     tone: str = "professional",
     debug: bool = False,
+    use_cache: bool = True,
+    seed: Optional[int] = None,
+    model: Optional[str] = None,
+    continue_on_truncation: bool = False,
+    examples: Optional[list] = None,
 ) -> Tuple[str, Optional[str]]:
     """
     Returns (post_text, prompt_if_debug_else_None).
     If debug=True, we also return the prompt so you can display it in UI.
+    Set use_cache=False to force a fresh completion; seed tells variants apart.
+    model is a MODEL_REGISTRY key or a raw Groq model id (default: DEFAULT_MODEL).
+    Output is capped by compute_max_tokens(); if the cap is hit, one continuation
+    call is made when continue_on_truncation=True, otherwise the post is trimmed
+    back to its last complete sentence.
     """
-    prompt = build_prompt(topic, length_label, language, custom_prompt, tone)
+    prompt = build_prompt(topic, length_label, language, custom_prompt, tone, examples)
 
     if debug:
         print("----- LLM PROMPT START -----")
         print(prompt)
         print("----- LLM PROMPT END -----")
 
-    response = client.chat.completions.create(
-        model="llama-3.1-8b-instant",
-        messages=[{"role": "user", "content": prompt}],
-        temperature=0.6,
+    spec = get_model_spec(model)
+    budget = min(compute_max_tokens(length_label, language), spec["max_tokens"])
+    raw, reason = _complete_with_reason(
+        prompt, spec["model"], spec["temperature"],
+        seed=seed, use_cache=use_cache, max_tokens=budget, stop=POST_STOP_SEQUENCES,
     )
+    if reason == "length" and continue_on_truncation:
+        continuation, reason = _complete_with_reason(
+            prompt + raw, spec["model"], spec["temperature"],
+            seed=seed, use_cache=use_cache, max_tokens=max(budget // 2, 64),
+            stop=POST_STOP_SEQUENCES, messages=_continuation_messages(prompt, raw),
+        )
+        raw = _join_continuation(raw, continuation)
+    if reason == "length":
+        raw = trim_to_sentence(raw)
+    cleaned = clean_text(raw)
+    return (cleaned, prompt if debug else None)
 
-    try:
-        raw = response.choices[0].message.content
-    except Exception:
-        raw = str(response)
 
-    cleaned = _clean_text(raw)
+async def agenerate_groq_post(
+    topic: str,
+    length_label: str,
+    language: str,
+    custom_prompt: Optional[str] = None,
+    tone: str = "professional",
+    debug: bool = False,
+    use_cache: bool = True,
+    seed: Optional[int] = None,
+    model: Optional[str] = None,
+    continue_on_truncation: bool = False,
+    examples: Optional[list] = None,
+) -> Tuple[str, Optional[str]]:
+    """
+    Async counterpart of generate_groq_post built on AsyncGroq.
+    Returns (post_text, prompt_if_debug_else_None).
+    """
+    prompt = build_prompt(topic, length_label, language, custom_prompt, tone, examples)
+
+    if debug:
+        print("----- LLM PROMPT START -----")
+        print(prompt)
+        print("----- LLM PROMPT END -----")
+
+    spec = get_model_spec(model)
+    budget = min(compute_max_tokens(length_label, language), spec["max_tokens"])
+    raw, reason = await _acomplete_with_reason(
+        prompt, spec["model"], spec["temperature"],
+        seed=seed, use_cache=use_cache, max_tokens=budget, stop=POST_STOP_SEQUENCES,
+    )
+    if reason == "length" and continue_on_truncation:
+        continuation, reason = await _acomplete_with_reason(
+            prompt + raw, spec["model"], spec["temperature"],
+            seed=seed, use_cache=use_cache, max_tokens=max(budget // 2, 64),
+            stop=POST_STOP_SEQUENCES, messages=_continuation_messages(prompt, raw),
+        )
+        raw = _join_continuation(raw, continuation)
+    if reason == "length":
+        raw = trim_to_sentence(raw)
+    cleaned = clean_text(raw)
     return (cleaned, prompt if debug else None)
 
 
-def generate_groq_hashtags(topic: str) -> list[str]:
+def stream_groq_post(
+    topic: str,
+    length_label: str,
+    language: str,
+    custom_prompt: Optional[str] = None,
+    tone: str = "professional",
+    debug: bool = False,
+    use_cache: bool = True,
+    seed: Optional[int] = None,
+    model: Optional[str] = None,
+    examples: Optional[list] = None,
+) -> Generator[str, None, Optional[str]]:
     """
-    Generate up to 8 short, relevant, space-separated hashtags. 
+    Streaming variant of generate_groq_post (stream=True).
+    Yields raw text chunks as they arrive; callers run clean_text on the
+    joined text once the stream ends. A cache hit is yielded as one chunk.
+    The generator returns the final finish_reason ("length" means the post was
+    cut off at max_tokens; see trim_to_sentence).
+    """
+    prompt = build_prompt(topic, length_label, language, custom_prompt, tone, examples)
+
+    if debug:
+        print("----- LLM PROMPT START -----")
+        print(prompt)
+        print("----- LLM PROMPT END -----")
+
+    spec = get_model_spec(model)
+    budget = min(compute_max_tokens(length_label, language), spec["max_tokens"])
+    key = _cache_key(
+        spec["model"], prompt, spec["temperature"], seed, max_tokens=budget, stop=POST_STOP_SEQUENCES
+    )
+    if use_cache:
+        cached = response_cache.get(key)
+        if cached is not None:
+            text, reason = _decode_cached(cached)
+            yield text
+            return reason
+
+    kwargs = _completion_kwargs(
+        spec["model"], prompt, spec["temperature"], seed, max_tokens=budget, stop=POST_STOP_SEQUENCES
+    )
+    kwargs["stream"] = True
+    parts = []
+    reason = None
+    usage = None
+    for chunk in _send(kwargs, prompt):
+        usage = getattr(getattr(chunk, "x_groq", None), "usage", None) or usage
+        try:
+            delta = chunk.choices[0].delta.content
+            reason = chunk.choices[0].finish_reason or reason
+        except (AttributeError, IndexError):
+            delta = None
+        if delta:
+            parts.append(delta)
+            yield delta
+    _settle_usage(kwargs, prompt, usage)
+
+    text = "".join(parts)
+    if text and use_cache:
+        response_cache.set(key, json.dumps([text, reason]))
+    return reason
+
+
+def build_multi_tone_prompt(
+    topic: str,
+    length_label: str,
+    language: str,
+    tones: Dict[str, str],
+    custom_prompt: Optional[str] = None,
+    examples: Optional[list] = None,
+) -> str:
     """
+    One prompt asking for every tone variant plus a single shared hashtag set,
+    returned as a JSON object so it can be split back into per-tone posts.
+    """
+    word_range = LENGTH_WORD_RANGES.get(length_label, "120-160 words")
+    lang_instruction = _language_instruction(language)
+    user_fragment = _user_fragment(custom_prompt)
+
+    tone_lines = "".join(f'- "{name}": {description}\n' for name, description in tones.items())
+    schema = ", ".join(f'"{name}": "<post text>"' for name in tones)
+
     prompt = (
+        "You are an expert LinkedIn post writer.\n\n"
+        f'Topic: "{topic}"\n'
+        f"{lang_instruction}\n"
+        f"Target length for EACH version: {word_range}.\n\n"
+        f"Write {len(tones)} separate versions of the post, one per tone:\n"
+        f"{tone_lines}\n"
+        "Structure of each version:\n"
+        "- Start with a short hook (1 sentence).\n"
+        "- Include 2–4 short paragraphs or bullet points with insights/lessons.\n"
+        "- End with a concise CTA or a question to invite comments.\n\n"
+        "Formatting:\n"
+        "- Use clean line breaks (\\n) and simple bullets inside each post.\n"
+        "- Sound human; avoid robotic phrasing.\n"
+        "- DO NOT include hashtags inside the posts.\n\n"
+        "Also generate 8 short, relevant LinkedIn hashtags shared by all versions.\n\n"
+        + _examples_fragment(examples)
+        + "Return ONLY a JSON object of this exact shape, no commentary:\n"
+        + f'{{"posts": {{{schema}}}, "hashtags": ["#Tag1", "#Tag2"]}}\n'
+        + user_fragment
+    )
+    return prompt
+
+
+def generate_groq_multi_tone(
+    topic: str,
+    length_label: str,
+    language: str,
+    tones: Dict[str, str],
+    custom_prompt: Optional[str] = None,
+    debug: bool = False,
+    use_cache: bool = True,
+    model: Optional[str] = None,
+    examples: Optional[list] = None,
+    seed: Optional[int] = None,
+) -> Tuple[Dict[str, str], list[str], Optional[str]]:
+    """
+    Generate every tone variant and one shared hashtag set in a single JSON-mode request.
+    Returns ({tone_name: post_text}, hashtags, prompt_if_debug_else_None).
+    Tones the model left out are omitted from the dict; raises ValueError if
+    the posts do not fit in one response (see multi_tone_budget), or if the
+    completion is not valid JSON or contains no usable post at all.
+    """
+    budget = multi_tone_budget(length_label, language, len(tones), model)
+    if budget is None:
+        raise ValueError("Multi-tone response would exceed the model's max_tokens; request tones separately")
+    prompt = build_multi_tone_prompt(topic, length_label, language, tones, custom_prompt, examples)
+
+    if debug:
+        print("----- LLM PROMPT START -----")
+        print(prompt)
+        print("----- LLM PROMPT END -----")
+
+    spec = get_model_spec(model)
+    raw, reason = _complete_with_reason(
+        prompt, spec["model"], spec["temperature"],
+        seed=seed, use_cache=use_cache, json_mode=True, max_tokens=budget,
+    )
+    # Truncated or invalid JSON is never cached (see _cacheable)
+    if reason == "length":
+        raise ValueError("Multi-tone response was cut off at max_tokens")
+    try:
+        data = json.loads(raw)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Multi-tone response was not valid JSON: {e}")
+
+    posts = data.get("posts") if isinstance(data, dict) else None
+    texts = {}
+    if isinstance(posts, dict):
+        for name in tones:
+            text = posts.get(name)
+            if isinstance(text, str) and text.strip():
+                texts[name] = clean_text(text)
+    if not texts:
+        # Valid JSON in the wrong shape was cached; drop it so the next request asks again
+        response_cache.delete(_cache_key(spec["model"], prompt, spec["temperature"], seed, True, budget))
+        if not isinstance(posts, dict):
+            raise ValueError("Multi-tone response is missing the 'posts' object")
+        raise ValueError("Multi-tone response did not contain any of the requested tones")
+
+    raw_tags = data.get("hashtags") or []
+    if isinstance(raw_tags, str):
+        raw_tags = raw_tags.split()
+    hashtags = _parse_hashtags(" ".join(str(t) for t in raw_tags))
+
+    return texts, hashtags, (prompt if debug else None)
+
+
+def _hashtag_prompt(topic: str) -> str:
+    return (
         "Generate 8 short, relevant LinkedIn hashtags for this topic:\n"
         f"{topic}\n\n"
         "Rules:\n"
@@ -141,17 +773,26 @@ def generate_groq_hashtags(topic: str) -> list[str]:
         "- No commentary, no bullets, no numbering."
     )
 
-    resp = client.chat.completions.create(
-        model="llama-3.1-8b-instant",
-        messages=[{"role": "user", "content": prompt}],
-        temperature=0.4,
-    )
-
-    try:
-        raw = resp.choices[0].message.content.strip()
-    except Exception:
-        raw = ""
 
-    tags = raw.split()
+def _parse_hashtags(raw: str) -> list[str]:
+    tags = raw.strip().split()
     tags = [t if t.startswith("#") else f"#{t}" for t in tags]
     return tags[:8]
+
+
+def generate_groq_hashtags(topic: str, use_cache: bool = True) -> list[str]:
+    """
+    Generate up to 8 short, relevant, space-separated hashtags. 
+    """
+    spec = get_model_spec(HASHTAG_MODEL)
+    raw = complete(_hashtag_prompt(topic), spec["model"], 0.4, use_cache=use_cache, max_tokens=64)
+    return _parse_hashtags(raw)
+
+
+async def agenerate_groq_hashtags(topic: str, use_cache: bool = True) -> list[str]:
+    """
+    Async counterpart of generate_groq_hashtags built on AsyncGroq.
+    """
+    spec = get_model_spec(HASHTAG_MODEL)
+    raw = await acomplete(_hashtag_prompt(topic), spec["model"], 0.4, use_cache=use_cache, max_tokens=64)
+    return _parse_hashtags(raw)
@@ -0,0 +1,209 @@
+"""
+jsonl_io.py - Streaming readers/writers for JSON arrays and JSONL files
+Records are read and written one at a time, so memory use does not grow
+with the size of the file. Also holds the append-only JSONL journal that
+resumable batch jobs (preprocess, batch_cli) checkpoint their results to.
+"""
+
+import concurrent.futures
+import json
+import os
+import re
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+READ_CHUNK_CHARS = 1 << 16
+_SCALAR_END = re.compile(r"[,\]\s]")
+
+
+def is_jsonl(path: str) -> bool:
+    return path.lower().endswith((".jsonl", ".ndjson"))
+
+
+def iter_records(path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Yield records from a .jsonl file (one object per line) or a .json file
+    holding a top-level array, without loading the whole file.
+    """
+    with open(path, encoding="utf-8") as f:
+        if is_jsonl(path):
+            for line_number, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError as e:
+                    raise ValueError(f"{path}:{line_number}: invalid JSON line ({e})")
+        else:
+            yield from _iter_json_array(f)
+
+
+def _iter_json_array(f) -> Iterator[Any]:
+    """Incrementally decode the elements of a top-level JSON array."""
+    decoder = json.JSONDecoder()
+    buf = ""
+    pos = 0
+    eof = False
+
+    def fill() -> None:
+        nonlocal buf, pos, eof
+        chunk = f.read(READ_CHUNK_CHARS)
+        if not chunk:
+            eof = True
+        buf = buf[pos:] + chunk
+        pos = 0
+
+    def next_char() -> str:
+        """Skip whitespace and return the next significant character ('' at EOF)."""
+        nonlocal pos
+        while True:
+            while pos < len(buf) and buf[pos].isspace():
+                pos += 1
+            if pos < len(buf):
+                return buf[pos]
+            if eof:
+                return ""
+            fill()
+
+    if next_char() != "[":
+        raise ValueError("Expected a JSON array at the top level")
+    pos += 1
+
+    # A value is expected at the start and after each comma; anything else must be "," or "]"
+    expect_value = True
+    after_comma = False
+    while True:
+        ch = next_char()
+        if ch == "":
+            raise ValueError("Unexpected end of file inside JSON array")
+        if ch == "]":
+            if after_comma:
+                raise ValueError("Trailing comma before ']' in JSON array")
+            return
+        if ch == ",":
+            if expect_value:
+                raise ValueError("Unexpected ',' in JSON array")
+            pos += 1
+            expect_value = after_comma = True
+            continue
+        if not expect_value:
+            raise ValueError("Missing ',' between JSON array elements")
+        if ch not in "{[\"":
+            # A bare number/literal may be split across chunks ("3.5" + "e3"); read on
+            # until its terminating delimiter is in the buffer before decoding it
+            while not eof and _SCALAR_END.search(buf, pos) is None:
+                fill()
+        while True:
+            try:
+                value, end = decoder.raw_decode(buf, pos)
+                break
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                fill()
+        pos = end
+        expect_value = after_comma = False
+        yield value
+
+
+class RecordWriter:
+    """
+    Write records one at a time as JSONL (for .jsonl/.ndjson paths) or as a
+    streamed JSON array (anything else). Use as a context manager.
+    """
+
+    def __init__(self, path: str, indent: int = 4):
+        self.path = path
+        self.jsonl = is_jsonl(path)
+        self.indent = None if self.jsonl else indent
+        self._file = None
+        self._count = 0
+
+    def __enter__(self) -> "RecordWriter":
+        self._file = open(self.path, encoding="utf-8", mode="w")
+        if not self.jsonl:
+            self._file.write("[")
+        return self
+
+    def write(self, record: Any) -> None:
+        if self.jsonl:
+            self._file.write(json.dumps(record) + "\n")
+        else:
+            self._file.write(("," if self._count else "") + "\n" + json.dumps(record, indent=self.indent))
+        self._count += 1
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if not self.jsonl:
+            self._file.write("\n]\n" if self._count else "]\n")
+        self._file.close()
+
+
+def iter_journal(path: str) -> Iterator[Dict[str, Any]]:
+    """Yield journal entries one at a time; a missing journal yields nothing."""
+    try:
+        with open(path, encoding="utf-8") as journal:
+            for line in journal:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    # A crash mid-write can leave a partial last line
+                    continue
+    except FileNotFoundError:
+        return
+
+
+def _open_journal(path: str):
+    """Open a journal for appending, starting on a fresh line if a crash left a partial one."""
+    needs_newline = False
+    if os.path.exists(path) and os.path.getsize(path):
+        with open(path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            needs_newline = f.read(1) != b"\n"
+    journal = open(path, encoding="utf-8", mode="a")
+    if needs_newline:
+        journal.write("\n")
+    return journal
+
+
+def run_journaled(
+    tasks: Iterable[Tuple[str, Any]],
+    work: Callable[[Any], Any],
+    journal_path: str,
+    to_entry: Callable[[str, Any, Any, Optional[BaseException]], Dict[str, Any]],
+    max_workers: int = 4,
+    window: Optional[int] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Run work(item) for every (key, item) in tasks on max_workers threads.
+
+    tasks may be any iterable (e.g. a streaming reader); at most `window` items
+    are in flight at once. As each one finishes, to_entry(key, item, result, error)
+    builds its journal entry (error is None on success), which is appended and
+    flushed to journal_path right away and then yielded, so an interrupted run
+    loses nothing that already finished.
+    """
+    window = window or max(1, max_workers) * 2
+    in_flight = {}
+
+    def finish(future, journal) -> Dict[str, Any]:
+        key, item = in_flight.pop(future)
+        error = future.exception()
+        entry = to_entry(key, item, None if error is not None else future.result(), error)
+        journal.write(json.dumps(entry) + "\n")
+        journal.flush()
+        return entry
+
+    with _open_journal(journal_path) as journal, \
+            concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for key, item in tasks:
+            if len(in_flight) >= window:
+                finished, _ = concurrent.futures.wait(
+                    in_flight, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in finished:
+                    yield finish(future, journal)
+            in_flight[executor.submit(work, item)] = (key, item)
+        for future in concurrent.futures.as_completed(list(in_flight)):
+            yield finish(future, journal)
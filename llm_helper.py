@@ -1,7 +1,29 @@
-from groq_llm import generate_groq_post, generate_groq_hashtags
+import os
+from functools import lru_cache
+
+from langchain_core.messages import AIMessage
+from langchain_core.output_parsers import JsonOutputParser
+from langchain_core.prompts import PromptTemplate
+from langchain_core.runnables import Runnable, RunnableLambda
+
+from groq_llm import (
+    DEFAULT_MODEL,
+    acomplete,
+    complete,
+    generate_groq_hashtags,
+    generate_groq_post,
+    get_model_spec,
+)
+
+# Structured extraction (preprocessing) wants deterministic JSON, not creative text
+EXTRACTION_MODEL = os.getenv("LINKGEN_EXTRACTION_MODEL", DEFAULT_MODEL)
+EXTRACTION_TEMPERATURE = 0.0
+# The JSON holds a couple of tags (and sometimes language); the limiter reserves this much per call
+EXTRACTION_MAX_TOKENS = 256
+
 
 def llm(topic, length, language):
-    post = generate_groq_post(topic, length, language)
+    post, _ = generate_groq_post(topic, length, language)
     tags = generate_groq_hashtags(topic)
 
     return {
@@ -9,3 +31,37 @@ def llm(topic, length, language):
         "hashtags": tags,
         "engagement": round(len(post) / 250, 2)
     }
+
+
+def _chat(prompt_value) -> AIMessage:
+    spec = get_model_spec(EXTRACTION_MODEL)
+    content = complete(
+        prompt_value.to_string(), spec["model"], EXTRACTION_TEMPERATURE,
+        json_mode=True, max_tokens=EXTRACTION_MAX_TOKENS,
+    )
+    return AIMessage(content=content)
+
+
+async def _achat(prompt_value) -> AIMessage:
+    spec = get_model_spec(EXTRACTION_MODEL)
+    content = await acomplete(
+        prompt_value.to_string(), spec["model"], EXTRACTION_TEMPERATURE,
+        json_mode=True, max_tokens=EXTRACTION_MAX_TOKENS,
+    )
+    return AIMessage(content=content)
+
+
+# LangChain chat model over groq_llm, so chains share its pooled client,
+# rate limiter and response cache. invoke/batch run _chat, ainvoke/abatch _achat.
+chat_model = RunnableLambda(_chat, afunc=_achat, name="groq_chat")
+
+_json_parser = JsonOutputParser()
+
+
+@lru_cache(maxsize=None)
+def get_extraction_chain(template: str) -> Runnable:
+    """
+    PromptTemplate | chat_model | JsonOutputParser for a template, built once per
+    process. Use .invoke/.ainvoke for one input, .batch/.abatch for many.
+    """
+    return PromptTemplate.from_template(template) | chat_model | _json_parser
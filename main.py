@@ -1,21 +1,56 @@
 # main.py (UPDATED - Added File Upload Feature)
 import streamlit as st
 from post_generator import (
-    generate_post,
-    generate_multi_tone_posts,
-    generate_multi_model_posts,
+    generate_post_streaming,
+    generate_variants,
+    TONES,
+    MODEL_VARIANTS,
 )
-from file_handler import process_uploaded_file, create_file_based_prompt  # NEW IMPORT
-import json
-import ast
+from file_handler import process_uploaded_file, create_file_based_prompt, supported_extensions  # NEW IMPORT
+from few_shot import get_store
+from text_normalize import extract_and_clean
 import html
-import re
+import random
 from datetime import datetime
 import urllib.parse
 
 # ---- PAGE CONFIG ----
 st.set_page_config(page_title="LinkGen AI", layout="centered")
 
+# ---- SHARED RESOURCES ----
+@st.cache_resource
+def load_few_shot_store():
+    """One example-post index per server process; reloads itself when the file changes."""
+    store = get_store()
+    store.get()  # warm the index once instead of on the first Generate click
+    return store
+
+
+FEW_SHOT_EXAMPLES = 2
+
+# Result panels rerun on their own when their widgets change instead of rerunning
+# the whole script. st.fragment is the stable name; Streamlit 1.33-1.36 ship it as
+# experimental_fragment, and older versions just render the panel inline.
+fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None) or (lambda func: func)
+
+
+# ---- HTML SNIPPETS ----
+# Plain helpers: st.cache_data would hash the arguments and unpickle a copy of the
+# result on every hit, which costs more than building these strings
+def hashtags_html(tags):
+    tags_html = " ".join(f"<span class='hashtag'>{html.escape(t)}</span>" for t in tags)
+    return f"<div style='margin-top:10px'><strong style='color:#fff'>Hashtags: </strong>{tags_html}</div>"
+
+
+def engagement_html(engagement):
+    return f"<div style='margin-top:8px;color:#dfeeff;'><strong>Engagement estimate:</strong> {html.escape(engagement)}</div>"
+
+
+def char_counter_html(char_count):
+    counter_class = "char-counter warning" if char_count > 3000 else "char-counter"
+    return f"<div class='{counter_class}'>Characters: {char_count}/3000</div>"
+
+
 # ---- SESSION STATE INITIALIZATION ----
 if 'post_history' not in st.session_state:
     st.session_state.post_history = []
@@ -38,7 +73,7 @@ if 'file_info' not in st.session_state:
     st.session_state.file_info = None
 
 # ---- CUSTOM STYLING ----
-st.markdown("""
+APP_CSS = """
     <style>
         body {
             background-color: #0A2342;
@@ -156,7 +191,10 @@ st.markdown("""
             color: #cfd8dc;
         }
     </style>
-""", unsafe_allow_html=True)
+"""
+
+
+st.markdown(APP_CSS, unsafe_allow_html=True)
 
 
 
@@ -190,8 +228,18 @@ use_multi_tone = st.checkbox(
 use_multi_model = st.checkbox(
     "Compare Multi-Models (3 models)", 
     value=False,
-    help="Generate 3 different model variants: Llama-3.1-8B, Llama-3.1-70B, and Groq"
+    help="Generate the same post with 3 different models: Llama-3.1-8B, Llama-3.3-70B, and Llama-4-Scout"
+)
+
+# ---- FEW-SHOT EXAMPLES CHECKBOX ----
+use_examples = st.checkbox(
+    "Use curated example posts for style",
+    value=True,
+    help="Adds a couple of matching posts from our example library to the prompt"
 )
+few_shot_k = FEW_SHOT_EXAMPLES if use_examples else 0
+if use_examples:
+    load_few_shot_store()
 
 # ---- NEW: FILE UPLOAD SECTION ----
 st.markdown("<hr style='margin: 20px 0; border: 1px solid #ffffff33;'>", unsafe_allow_html=True)
@@ -199,8 +247,8 @@ st.markdown("<h3 style='color: white;'>📄 Upload File (Optional)</h3>", unsafe
 st.markdown("<p style='color: #9ed2ff; font-size: 14px;'>Upload a resume, presentation, or document to generate a LinkedIn post based on its content</p>", unsafe_allow_html=True)
 
 uploaded_file = st.file_uploader(
-    "Choose a file (PDF, DOCX, PPTX, TXT)",
-    type=['pdf', 'docx', 'pptx', 'txt'],
+    "Choose a file (PDF, DOCX, PPTX, TXT, MD, HTML, RTF)",
+    type=supported_extensions(),
     help="Max file size: 10MB"
 )
 
@@ -262,100 +310,6 @@ st.markdown('<div class="card"><strong style="font-size:20px;color:#ffffff">Desc
 st.write("Example: I completed my first internship at Google – write a short celebratory post with two lessons learned.")
 custom_prompt = st.text_area("Type your custom prompt (optional)", value="", height=100)
 
-# -----------------------
-# Helper: clean & extract result
-# -----------------------
-def extract_and_clean(raw_result):
-    """
-    Accept various shapes from generate_post and clean them
-    """
-    out = {"post": "", "hashtags": [], "engagement": None}
-
-    if isinstance(raw_result, dict):
-        out["post"] = raw_result.get("post") or raw_result.get("text") or raw_result.get("content") or ""
-        tags = raw_result.get("hashtags", raw_result.get("tags", []))
-        if isinstance(tags, str):
-            out["hashtags"] = [t.strip() for t in tags.split(",") if t.strip()]
-        elif isinstance(tags, list):
-            out["hashtags"] = tags
-        out["engagement"] = raw_result.get("engagement", raw_result.get("score"))
-        out["tone"] = raw_result.get("tone", "")
-        return clean_text_output(out)
-
-    if isinstance(raw_result, str):
-        s = raw_result.strip()
-        try:
-            parsed = json.loads(s)
-            if isinstance(parsed, dict):
-                return extract_and_clean(parsed)
-        except Exception:
-            pass
-        try:
-            parsed = ast.literal_eval(s)
-            if isinstance(parsed, dict):
-                return extract_and_clean(parsed)
-        except Exception:
-            pass
-        try:
-            unescaped = bytes(s, "utf-8").decode("unicode_escape")
-        except Exception:
-            unescaped = s
-
-        if "{" in unescaped and "}" in unescaped:
-            start = unescaped.find("{")
-            end = unescaped.rfind("}") + 1
-            try:
-                piece = unescaped[start:end]
-                parsed = json.loads(piece)
-                if isinstance(parsed, dict):
-                    return extract_and_clean(parsed)
-            except Exception:
-                pass
-
-        out["post"] = unescaped
-        return clean_text_output(out)
-
-    out["post"] = str(raw_result)
-    return clean_text_output(out)
-
-def clean_text_output(out):
-    post = out.get("post", "") or ""
-    post = post.replace("\\/", "/")
-    post = post.replace("\\n", "\n")
-    post = post.replace("\\", "")
-
-    post = re.sub(r'\.{3,}', '...', post)
-    post = re.sub(r'-{3,}', '---', post)
-    post = re.sub(r'\s{3,}', '  ', post)
-
-    post = post.replace("\r\n", "\n").replace("\r", "\n")
-    post = post.strip(" \n\r\t\"'")
-    safe = html.escape(post)
-
-    paragraphs = [p.strip() for p in safe.split("\n\n") if p.strip()]
-    newline_token = '\n'
-    if paragraphs:
-        html_paragraphs = "".join(
-            "<p style='margin:8px 0; line-height:1.6;'>{}</p>".format(p.replace(newline_token, ' '))
-            for p in paragraphs
-        )
-    else:
-        html_paragraphs = "<p style='margin:8px 0; line-height:1.6;'>{}</p>".format(safe)
-
-    out["post_html"] = html_paragraphs
-    tags = out.get("hashtags") or []
-    clean_tags = []
-    if isinstance(tags, str):
-        clean_tags = [t.strip() for t in tags.split(",") if t.strip()]
-    elif isinstance(tags, list):
-        for t in tags:
-            if isinstance(t, str):
-                clean_tags.append(t.strip())
-            else:
-                clean_tags.append(str(t))
-    out["hashtags"] = clean_tags
-    return out
-
 # -----------------------
 # BUTTON AND GENERATION LOGIC
 # -----------------------
@@ -394,7 +348,7 @@ def build_prompt(base_prompt, length_hint, language_hint):
 if generate_clicked:
     spinner_text = "Generating your post..."
     if use_multi_tone and use_multi_model:
-        spinner_text = "Generating multi-tone + multi-model results... this may take 10-15 seconds ⏳"
+        spinner_text = "Generating multi-tone + multi-model results... ⏳"
     elif use_multi_tone:
         spinner_text = "Generating 3 tone variations... This may take 5-10 seconds ⏳"
     elif use_multi_model:
@@ -417,7 +371,7 @@ if generate_clicked:
                 base = f"Generate a LinkedIn post about {topic}."
 
         prompt_input = build_prompt(base, length, language)
-        st.session_state.last_inputs = {
+        inputs = {
             'prompt': prompt_input,
             'length': length,
             'language': language,
@@ -425,8 +379,13 @@ if generate_clicked:
             'custom_prompt': custom_prompt,
             'use_multi_tone': use_multi_tone,
             'use_multi_model': use_multi_model,
+            'few_shot_k': few_shot_k,
             'used_file': st.session_state.file_info.get("filename") if st.session_state.file_info else None
         }
+        # Clicking Generate again with unchanged inputs means "give me another one":
+        # a new seed skips the cached response for these inputs
+        seed = random.randrange(2 ** 31) if inputs == st.session_state.last_inputs else None
+        st.session_state.last_inputs = inputs
 
         # FIXED: Clear previous results first
         st.session_state.show_multi_model = False
@@ -434,43 +393,67 @@ if generate_clicked:
         st.session_state.multi_model_posts = {}
         st.session_state.multi_tone_posts = {}
 
-        # MULTI-MODEL BRANCH (sequential generation)
-        if use_multi_model:
-            st.session_state.show_multi_model = True
-            multi_model_res = generate_multi_model_posts(
-                topic=prompt_input,
-                length=length,
-                language=language,
-                custom_prompt=custom_prompt,
-                use_parallel=False
-            )
-            st.session_state.multi_model_posts = {}
-            for model_name, res in multi_model_res.items():
-                st.session_state.multi_model_posts[model_name] = extract_and_clean(res)
-            if st.session_state.multi_model_posts:
-                first_model = list(st.session_state.multi_model_posts.keys())[0]
-                st.session_state.current_post = st.session_state.multi_model_posts[first_model]
-
-        # MULTI-TONE BRANCH (FIXED - 3 tones)
-        if use_multi_tone:
-            st.session_state.show_multi_tone = True
-            multi_results = generate_multi_tone_posts(
+        # MULTI-MODEL + MULTI-TONE: one bounded pool runs every requested variant,
+        # and each result lands in session state as soon as it completes
+        if use_multi_model or use_multi_tone:
+            st.session_state.show_multi_model = use_multi_model
+            st.session_state.show_multi_tone = use_multi_tone
+            total_variants = (len(MODEL_VARIANTS) if use_multi_model else 0) + (len(TONES) if use_multi_tone else 0)
+            progress = st.progress(0.0, text=f"0/{total_variants} variants ready")
+
+            def store_variant(kind, name, res):
+                target = st.session_state.multi_tone_posts if kind == "tone" else st.session_state.multi_model_posts
+                target[name] = extract_and_clean(res)
+                done_count = len(st.session_state.multi_tone_posts) + len(st.session_state.multi_model_posts)
+                progress.progress(
+                    min(done_count / total_variants, 1.0),
+                    text=f"{done_count}/{total_variants} variants ready ({name} done)"
+                )
+
+            generate_variants(
                 topic=prompt_input,
                 length=length,
                 language=language,
                 custom_prompt=custom_prompt,
-                use_parallel=False
+                include_tones=use_multi_tone,
+                include_models=use_multi_model,
+                batched_tones=True,
+                few_shot_k=few_shot_k,
+                on_result=store_variant,
+                seed=seed
             )
-            st.session_state.multi_tone_posts = {}
-            for tone_name, result in multi_results.items():
-                st.session_state.multi_tone_posts[tone_name] = extract_and_clean(result)
-            if st.session_state.multi_tone_posts:
-                first_tone = list(st.session_state.multi_tone_posts.keys())[0]
-                st.session_state.current_post = st.session_state.multi_tone_posts[first_tone]
+            progress.empty()
+
+            # Re-key in display order (results arrive in completion order)
+            st.session_state.multi_model_posts = {
+                name: st.session_state.multi_model_posts[name]
+                for name in MODEL_VARIANTS if name in st.session_state.multi_model_posts
+            }
+            st.session_state.multi_tone_posts = {
+                name: st.session_state.multi_tone_posts[name]
+                for name in TONES if name in st.session_state.multi_tone_posts
+            }
+            first_variants = st.session_state.multi_tone_posts or st.session_state.multi_model_posts
+            if first_variants:
+                st.session_state.current_post = next(iter(first_variants.values()))
 
         # If neither comparison selected, single generate
         if not use_multi_tone and not use_multi_model:
-            result = generate_post(prompt_input, length, language, custom_prompt=custom_prompt)
+            # Stream tokens into a placeholder so the first words show up immediately;
+            # hashtags are fetched in the background while the post streams
+            stream_placeholder = st.empty()
+
+            def render_partial(text):
+                stream_placeholder.markdown(
+                    f"<div class='card'>{html.escape(text).replace(chr(10), '<br>')}▌</div>",
+                    unsafe_allow_html=True
+                )
+
+            result = generate_post_streaming(
+                prompt_input, length, language, custom_prompt=custom_prompt,
+                few_shot_k=few_shot_k, on_chunk=render_partial, seed=seed
+            )
+            stream_placeholder.empty()
             parsed = extract_and_clean(result)
             st.session_state.current_post = parsed
 
@@ -486,10 +469,11 @@ if generate_clicked:
 # -----------------------
 # MULTI-MODEL DISPLAY SECTION
 # -----------------------
-if st.session_state.show_multi_model and st.session_state.multi_model_posts:
+@fragment
+def render_multi_model_section():
     st.markdown("<hr style='margin: 30px 0; border: 1px solid #ffffff33;'>", unsafe_allow_html=True)
     st.markdown("<h2 style='color:white; text-align:center;'>Multi-Model Comparison</h2>", unsafe_allow_html=True)
-    st.markdown("<p style='text-align:center; color:#9ed2ff; margin-bottom:20px;'>Compare how different model variants render the same prompt.</p>", unsafe_allow_html=True)
+    st.markdown("<p style='text-align:center; color:#9ed2ff; margin-bottom:20px;'>Compare how different models render the same prompt.</p>", unsafe_allow_html=True)
 
     model_names = list(st.session_state.multi_model_posts.keys())
     if model_names:
@@ -506,8 +490,7 @@ if st.session_state.show_multi_model and st.session_state.multi_model_posts:
                 full_text = f"{post_text}\n\n{' '.join(tags)}".strip()
 
                 char_count = len(full_text)
-                counter_class = "char-counter warning" if char_count > 3000 else "char-counter"
-                st.markdown(f"<div class='{counter_class}'>Characters: {char_count}/3000</div>", unsafe_allow_html=True)
+                st.markdown(char_counter_html(char_count), unsafe_allow_html=True)
 
                 st.markdown("<p style='color:#9ed2ff; font-size:13px; margin-top:10px;'>Edit below:</p>", unsafe_allow_html=True)
                 edited_model_post = st.text_area(f"{model_name} output", value=full_text, height=220, key=f"model_{model_name}_edit", label_visibility="collapsed")
@@ -547,20 +530,26 @@ if st.session_state.show_multi_model and st.session_state.multi_model_posts:
 
                 st.markdown("<hr style='margin: 15px 0; border: 1px solid #ffffff22;'>", unsafe_allow_html=True)
                 st.markdown(f"<h4 style='color:#9ed2ff;'>{model_name} Preview</h4>", unsafe_allow_html=True)
+                if model_post.get("model_id"):
+                    st.markdown(f"<p style='color:#cfd8dc; font-size:12px;'>Model: {html.escape(model_post['model_id'])}</p>", unsafe_allow_html=True)
                 st.markdown(model_post.get("post_html", ""), unsafe_allow_html=True)
 
                 if tags:
-                    tags_html = " ".join(f"<span class='hashtag'>{html.escape(t)}</span>" for t in tags)
-                    st.markdown(f"<div style='margin-top:10px'><strong style='color:#fff'>Hashtags: </strong>{tags_html}</div>", unsafe_allow_html=True)
+                    st.markdown(hashtags_html(tags), unsafe_allow_html=True)
 
                 eng = model_post.get("engagement")
                 if eng:
-                    st.markdown(f"<div style='margin-top:8px;color:#dfeeff;'><strong>Engagement estimate:</strong> {html.escape(str(eng))}</div>", unsafe_allow_html=True)
+                    st.markdown(engagement_html(str(eng)), unsafe_allow_html=True)
+
+
+if st.session_state.show_multi_model and st.session_state.multi_model_posts:
+    render_multi_model_section()
 
 # -----------------------
 # MULTI-TONE DISPLAY (FIXED - 3 tones)
 # -----------------------
-if st.session_state.show_multi_tone and st.session_state.multi_tone_posts:
+@fragment
+def render_multi_tone_section():
     st.markdown("<hr style='margin: 30px 0; border: 1px solid #ffffff33;'>", unsafe_allow_html=True)
     st.markdown("<h2 style='color:white; text-align:center;'>Multi-Tone Variations</h2>", unsafe_allow_html=True)
     st.markdown("<p style='text-align:center; color:#9ed2ff; margin-bottom:20px;'>Choose the tone that best fits your audience and message</p>", unsafe_allow_html=True)
@@ -586,8 +575,7 @@ if st.session_state.show_multi_tone and st.session_state.multi_tone_posts:
             full_text = f"{post_text}\n\n{' '.join(tags)}".strip()
 
             char_count = len(full_text)
-            counter_class = "char-counter warning" if char_count > 3000 else "char-counter"
-            st.markdown(f"<div class='{counter_class}'>Characters: {char_count}/3000</div>", unsafe_allow_html=True)
+            st.markdown(char_counter_html(char_count), unsafe_allow_html=True)
 
             st.markdown("<p style='color:#9ed2ff; font-size:13px; margin-top:10px;'>Edit below:</p>", unsafe_allow_html=True)
             edited_tone_post = st.text_area(
@@ -644,17 +632,21 @@ if st.session_state.show_multi_tone and st.session_state.multi_tone_posts:
             st.markdown(post_html, unsafe_allow_html=True)
 
             if tags:
-                tags_html = " ".join(f"<span class='hashtag'>{html.escape(t)}</span>" for t in tags)
-                st.markdown(f"<div style='margin-top:10px'><strong style='color:#fff'>Hashtags: </strong>{tags_html}</div>", unsafe_allow_html=True)
+                st.markdown(hashtags_html(tags), unsafe_allow_html=True)
 
             eng = tone_post.get("engagement")
             if eng:
-                st.markdown(f"<div style='margin-top:8px;color:#dfeeff;'><strong>Engagement estimate:</strong> {html.escape(str(eng))}</div>", unsafe_allow_html=True)
+                st.markdown(engagement_html(str(eng)), unsafe_allow_html=True)
+
+
+if st.session_state.show_multi_tone and st.session_state.multi_tone_posts:
+    render_multi_tone_section()
 
 # -----------------------
 # SINGLE POST DISPLAY
 # -----------------------
-if st.session_state.current_post and not st.session_state.show_multi_tone and not st.session_state.show_multi_model:
+@fragment
+def render_single_post_section():
     st.markdown("<hr style='margin: 30px 0; border: 1px solid #ffffff33;'>", unsafe_allow_html=True)
     st.markdown("<h2 style='color:white; text-align:center;'>Generated Post</h2>", unsafe_allow_html=True)
     
@@ -663,8 +655,7 @@ if st.session_state.current_post and not st.session_state.show_multi_tone and no
     full_text = f"{post_text}\n\n{' '.join(tags)}".strip()
 
     char_count = len(full_text)
-    counter_class = "char-counter warning" if char_count > 3000 else "char-counter"
-    st.markdown(f"<div class='{counter_class}'>Characters: {char_count}/3000</div>", unsafe_allow_html=True)
+    st.markdown(char_counter_html(char_count), unsafe_allow_html=True)
 
     st.markdown("<p style='color:#9ed2ff; font-size:13px; margin-top:10px;'>Edit your post below:</p>", unsafe_allow_html=True)
     edited_post = st.text_area("Edit Post", value=full_text, height=250, label_visibility="collapsed")
@@ -698,17 +689,21 @@ if st.session_state.current_post and not st.session_state.show_multi_tone and no
     st.markdown(post_html, unsafe_allow_html=True)
 
     if tags:
-        tags_html = " ".join(f"<span class='hashtag'>{html.escape(t)}</span>" for t in tags)
-        st.markdown(f"<div style='margin-top:10px'><strong style='color:#fff'>Hashtags: </strong>{tags_html}</div>", unsafe_allow_html=True)
+        st.markdown(hashtags_html(tags), unsafe_allow_html=True)
 
     eng = st.session_state.current_post.get("engagement")
     if eng:
-        st.markdown(f"<div style='margin-top:8px;color:#dfeeff;'><strong>Engagement estimate:</strong> {html.escape(str(eng))}</div>", unsafe_allow_html=True)
+        st.markdown(engagement_html(str(eng)), unsafe_allow_html=True)
+
+
+if st.session_state.current_post and not st.session_state.show_multi_tone and not st.session_state.show_multi_model:
+    render_single_post_section()
 
 # -----------------------
 # POST HISTORY SECTION
 # -----------------------
-if st.session_state.post_history:
+@fragment
+def render_history_section():
     st.markdown("<hr style='margin: 30px 0; border: 1px solid #ffffff33;'>", unsafe_allow_html=True)
     st.markdown("<h2 style='color:white; text-align:center;'>Post History</h2>", unsafe_allow_html=True)
     st.markdown("<p style='text-align:center; color:#9ed2ff; margin-bottom:20px;'>Your last 5 generated posts</p>", unsafe_allow_html=True)
@@ -722,8 +717,7 @@ if st.session_state.post_history:
             st.markdown(post_data.get("post_html", ""), unsafe_allow_html=True)
             
             if tags:
-                tags_html = " ".join(f"<span class='hashtag'>{html.escape(t)}</span>" for t in tags)
-                st.markdown(f"<div style='margin-top:10px'><strong style='color:#fff'>Hashtags: </strong>{tags_html}</div>", unsafe_allow_html=True)
+                st.markdown(hashtags_html(tags), unsafe_allow_html=True)
             
             full_text = f"{post_text}\n\n{' '.join(tags)}".strip()
             
@@ -748,6 +742,10 @@ if st.session_state.post_history:
                     st.session_state.show_multi_model = False
                     st.rerun()
 
+
+if st.session_state.post_history:
+    render_history_section()
+
 # -----------------------
 # FOOTER
 # -----------------------
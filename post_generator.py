@@ -1,11 +1,40 @@
-# post_generator.py (FIXED - Rate Limit Handling with 3 Tones)
-from typing import Optional, Dict, Any
+# post_generator.py (Rate limits handled by the shared limiter in groq_llm)
+from typing import Optional, Dict, Any, Callable
+import asyncio
+import os
 import concurrent.futures
-from datetime import datetime
-import time
+
+from groq import RateLimitError
 
 # Import the low-level generation functions
-from groq_llm import generate_groq_post, generate_groq_hashtags
+from groq_llm import (
+    generate_groq_post,
+    generate_groq_hashtags,
+    agenerate_groq_post,
+    agenerate_groq_hashtags,
+    generate_groq_multi_tone,
+    multi_tone_budget,
+    stream_groq_post,
+    trim_to_sentence,
+    build_prompt,
+    get_model_spec,
+)
+from few_shot import get_store
+from text_normalize import clean_text
+
+
+def select_examples(topic: str, length: str, language: str, k: int) -> Optional[list]:
+    """Top-k curated example posts for a request, or None if disabled or unavailable."""
+    if k <= 0:
+        return None
+    try:
+        posts = get_store().get()
+    except Exception as e:
+        print(f"Few-shot examples unavailable: {e}")
+        return None
+    if posts is None:
+        return None
+    return posts.get_examples(topic, length, language, k) or None
 
 
 def generate_post(
@@ -14,9 +43,15 @@ def generate_post(
     language: str,
     custom_prompt: Optional[str] = None,
     debug: bool = False,
+    few_shot_k: int = 0,
+    seed: Optional[int] = None,
+    use_cache: bool = True,
 ) -> Dict[str, Any]:
     """
     Orchestrates: post -> hashtags -> engagement score.
+    few_shot_k > 0 injects that many matching curated example posts into the prompt.
+    Identical calls are served from groq_llm's response cache; pass a new seed (or
+    use_cache=False) to get a different post for the same inputs.
     Returns a dict consumed by main.py
     """
     post_text, maybe_prompt = generate_groq_post(
@@ -26,9 +61,12 @@ def generate_post(
         custom_prompt=custom_prompt,
         tone="professional",
         debug=debug,
+        examples=select_examples(topic, length, language, few_shot_k),
+        seed=seed,
+        use_cache=use_cache,
     )
 
-    hashtags = generate_groq_hashtags(topic)
+    hashtags = generate_groq_hashtags(topic, use_cache=use_cache)
 
     # lightweight engagement proxy: chars/250 (rounded)
     engagement = round(len(post_text) / 250.0, 2)
@@ -45,7 +83,237 @@ def generate_post(
     return result
 
 
-# ===== MULTI-TONE (FIXED with 3 tones and rate limit handling) =====
+async def agenerate_post(
+    topic: str,
+    length: str,
+    language: str,
+    custom_prompt: Optional[str] = None,
+    debug: bool = False,
+    few_shot_k: int = 0,
+    seed: Optional[int] = None,
+    use_cache: bool = True,
+) -> Dict[str, Any]:
+    """
+    Async variant of generate_post.
+    Hashtags only depend on the topic, so the post and hashtag requests
+    are sent concurrently instead of one after the other.
+    """
+    (post_text, maybe_prompt), hashtags = await asyncio.gather(
+        agenerate_groq_post(
+            topic=topic,
+            length_label=length,
+            language=language,
+            custom_prompt=custom_prompt,
+            tone="professional",
+            debug=debug,
+            examples=select_examples(topic, length, language, few_shot_k),
+            seed=seed,
+            use_cache=use_cache,
+        ),
+        agenerate_groq_hashtags(topic, use_cache=use_cache),
+    )
+
+    engagement = round(len(post_text) / 250.0, 2)
+
+    result = {
+        "post": post_text,
+        "hashtags": hashtags,
+        "engagement": engagement,
+    }
+
+    if debug:
+        result["debug_prompt"] = maybe_prompt
+
+    return result
+
+
+def generate_post_streaming(
+    topic: str,
+    length: str,
+    language: str,
+    custom_prompt: Optional[str] = None,
+    debug: bool = False,
+    few_shot_k: int = 0,
+    on_chunk: Optional[Callable[[str], None]] = None,
+    seed: Optional[int] = None,
+    use_cache: bool = True,
+) -> Dict[str, Any]:
+    """
+    Like generate_post, but streams the post text as it is generated.
+    on_chunk is called with the accumulated (uncleaned) text after every chunk,
+    so a UI can render progressively. Hashtags are fetched in a background
+    thread while the post streams. Returns the same dict as generate_post.
+    """
+    examples = select_examples(topic, length, language, few_shot_k)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+        hashtags_future = executor.submit(generate_groq_hashtags, topic, use_cache)
+
+        streamed = ""
+        stream = stream_groq_post(
+            topic=topic,
+            length_label=length,
+            language=language,
+            custom_prompt=custom_prompt,
+            tone="professional",
+            debug=debug,
+            examples=examples,
+            seed=seed,
+            use_cache=use_cache,
+        )
+        while True:
+            try:
+                chunk = next(stream)
+            except StopIteration as stop:
+                reason = stop.value
+                break
+            streamed += chunk
+            if on_chunk is not None:
+                on_chunk(streamed)
+
+        hashtags = hashtags_future.result()
+
+    # Same as generate_groq_post: a post cut off at max_tokens loses its half-sentence
+    if reason == "length":
+        streamed = trim_to_sentence(streamed)
+    post_text = clean_text(streamed)
+    engagement = round(len(post_text) / 250.0, 2)
+
+    result = {
+        "post": post_text,
+        "hashtags": hashtags,
+        "engagement": engagement,
+    }
+
+    if debug:
+        result["debug_prompt"] = build_prompt(topic, length, language, custom_prompt, "professional", examples)
+
+    return result
+
+
+# ===== MULTI-TONE (3 tones, paced by the shared rate limiter) =====
+
+# Tone names with their descriptions (reduced from 5 to 3 to avoid rate limits)
+TONES = {
+    "Professional": "formal, business-appropriate, and polished",
+    "Casual": "friendly, conversational, and approachable",
+    "Inspirational": "uplifting, motivational, and energizing"
+}
+
+# Upper bound on variants generated at the same time; the limiter still paces requests
+DEFAULT_MAX_CONCURRENCY = int(os.getenv("LINKGEN_MAX_CONCURRENCY", "4"))
+
+
+def _generate_tone_variant(
+    topic: str,
+    length: str,
+    language: str,
+    tone_name: str,
+    tone_description: str,
+    custom_prompt: Optional[str] = None,
+    debug: bool = False,
+    examples: Optional[list] = None,
+    seed: Optional[int] = None,
+    use_cache: bool = True,
+) -> tuple:
+    """Generate a single tone variation. Returns (tone_name, result).
+    Rate limiting and 429 retries are handled by the shared limiter in groq_llm."""
+    try:
+        post_text, maybe_prompt = generate_groq_post(
+            topic=topic,
+            length_label=length,
+            language=language,
+            custom_prompt=custom_prompt,
+            tone=tone_description,
+            debug=debug,
+            examples=examples,
+            seed=seed,
+            use_cache=use_cache,
+        )
+
+        # Generate hashtags for this tone (same topic-based hashtags)
+        hashtags = generate_groq_hashtags(topic, use_cache=use_cache)
+
+        # Calculate engagement score
+        engagement = round(len(post_text) / 250.0, 2)
+
+        result = {
+            "post": post_text,
+            "hashtags": hashtags,
+            "engagement": engagement,
+            "tone": tone_name,
+        }
+
+        if debug:
+            result["debug_prompt"] = maybe_prompt
+
+        return tone_name, result
+
+    except RateLimitError:
+        # Limiter retries exhausted, return a fallback
+        return tone_name, {
+            "post": f"Unable to generate {tone_name} tone due to rate limits. Please try again in a moment or uncheck multi-tone for single generation.",
+            "hashtags": [],
+            "engagement": 0,
+            "tone": tone_name,
+            "error": True
+        }
+    except Exception as e:
+        return tone_name, {
+            "post": f"Error generating {tone_name} tone: {str(e)}",
+            "hashtags": [],
+            "engagement": 0,
+            "tone": tone_name,
+            "error": True
+        }
+
+
+def _generate_tone_batch(
+    topic: str,
+    length: str,
+    language: str,
+    tones: Dict[str, str],
+    custom_prompt: Optional[str] = None,
+    debug: bool = False,
+    examples: Optional[list] = None,
+    seed: Optional[int] = None,
+    use_cache: bool = True,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Generate all tones in one JSON request. Returns whatever tones came back;
+    an empty dict means the caller should fall back to one request per tone.
+    """
+    results: Dict[str, Dict[str, Any]] = {}
+    # Long posts in token-heavy languages do not all fit in one response
+    if multi_tone_budget(length, language, len(tones)) is None:
+        return results
+    try:
+        texts, hashtags, maybe_prompt = generate_groq_multi_tone(
+            topic=topic,
+            length_label=length,
+            language=language,
+            tones=tones,
+            custom_prompt=custom_prompt,
+            debug=debug,
+            examples=examples,
+            seed=seed,
+            use_cache=use_cache,
+        )
+    except Exception as e:
+        print(f"Batched multi-tone generation failed ({e}); falling back to one request per tone.")
+        return results
+
+    for tone_name, post_text in texts.items():
+        result = {
+            "post": post_text,
+            "hashtags": hashtags,
+            "engagement": round(len(post_text) / 250.0, 2),
+            "tone": tone_name,
+        }
+        if debug:
+            result["debug_prompt"] = maybe_prompt
+        results[tone_name] = result
+    return results
+
 
 def generate_multi_tone_posts(
     topic: str,
@@ -53,7 +321,9 @@ def generate_multi_tone_posts(
     language: str,
     custom_prompt: Optional[str] = None,
     debug: bool = False,
+    few_shot_k: int = 0,
     use_parallel: bool = False,
+    batched: bool = False,
 ) -> Dict[str, Dict[str, Any]]:
     """
     Generate 3 different tone variations of a post.
@@ -65,113 +335,28 @@ def generate_multi_tone_posts(
         language: Language for the post
         custom_prompt: Optional custom prompt
         debug: Enable debug mode
-        use_parallel: Generate tones in parallel (not recommended, may hit rate limits)
+        few_shot_k: Number of curated example posts to inject into the prompt
+        use_parallel: Generate tones in parallel (requests are still paced by the rate limiter)
+        batched: Ask for all tones plus one shared hashtag set in a single JSON request;
+            tones missing from that response fall back to one request per tone
 
     Returns:
         Dictionary with tone names as keys and post data as values
         Example: {"Professional": {...}, "Casual": {...}, "Inspirational": {...}}
     """
-
-    # Define the 3 tones with their descriptions (reduced from 5 to avoid rate limits)
-    tones = {
-        "Professional": "formal, business-appropriate, and polished",
-        "Casual": "friendly, conversational, and approachable",
-        "Inspirational": "uplifting, motivational, and energizing"
-    }
-
-    def generate_single_tone(tone_name: str, tone_description: str, retry_count: int = 3) -> tuple:
-        """Helper function to generate a single tone variation with retry logic"""
-        for attempt in range(retry_count):
-            try:
-                post_text, maybe_prompt = generate_groq_post(
-                    topic=topic,
-                    length_label=length,
-                    language=language,
-                    custom_prompt=custom_prompt,
-                    tone=tone_description,
-                    debug=debug,
-                )
-
-                # Generate hashtags for this tone (same topic-based hashtags)
-                hashtags = generate_groq_hashtags(topic)
-
-                # Calculate engagement score
-                engagement = round(len(post_text) / 250.0, 2)
-
-                result = {
-                    "post": post_text,
-                    "hashtags": hashtags,
-                    "engagement": engagement,
-                    "tone": tone_name,
-                }
-
-                if debug:
-                    result["debug_prompt"] = maybe_prompt
-
-                return tone_name, result
-
-            except Exception as e:
-                error_msg = str(e)
-                # Check if it's a rate limit error
-                if "rate_limit" in error_msg.lower() or "429" in error_msg:
-                    if attempt < retry_count - 1:
-                        # Wait before retrying (exponential backoff)
-                        wait_time = (attempt + 1) * 2  # 2, 4, 6 seconds
-                        print(f"Rate limit hit for {tone_name}. Waiting {wait_time}s before retry {attempt + 2}/{retry_count}...")
-                        time.sleep(wait_time)
-                        continue
-                    else:
-                        # Max retries reached, return a fallback
-                        return tone_name, {
-                            "post": f"Unable to generate {tone_name} tone due to rate limits. Please try again in a moment or uncheck multi-tone for single generation.",
-                            "hashtags": [],
-                            "engagement": 0,
-                            "tone": tone_name,
-                            "error": True
-                        }
-                else:
-                    # Non-rate-limit error
-                    return tone_name, {
-                        "post": f"Error generating {tone_name} tone: {error_msg}",
-                        "hashtags": [],
-                        "engagement": 0,
-                        "tone": tone_name,
-                        "error": True
-                    }
-
-        # Should not reach here, but just in case
-        return tone_name, {
-            "post": f"Error generating {tone_name} tone after {retry_count} attempts.",
-            "hashtags": [],
-            "engagement": 0,
-            "tone": tone_name,
-            "error": True
-        }
-
-    results: Dict[str, Dict[str, Any]] = {}
-
-    if use_parallel:
-        # Parallel generation (faster but may hit rate limits)
-        with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
-            future_to_tone = {
-                executor.submit(generate_single_tone, tone_name, tone_desc): tone_name
-                for tone_name, tone_desc in tones.items()
-            }
-
-            for future in concurrent.futures.as_completed(future_to_tone):
-                tone_name, result = future.result()
-                results[tone_name] = result
-    else:
-        # Sequential generation (safer, avoids rate limits)
-        for idx, (tone_name, tone_description) in enumerate(tones.items()):
-            # Add a delay between requests to avoid rate limits (2 seconds for safety)
-            if idx > 0:
-                time.sleep(2.0)  # 2 second delay between each tone
-            
-            tone_name, result = generate_single_tone(tone_name, tone_description)
-            results[tone_name] = result
-
-    return results
+    variants = generate_variants(
+        topic=topic,
+        length=length,
+        language=language,
+        custom_prompt=custom_prompt,
+        debug=debug,
+        few_shot_k=few_shot_k,
+        include_tones=True,
+        include_models=False,
+        batched_tones=batched,
+        max_concurrency=2 if use_parallel else 1,
+    )
+    return variants["tones"]
 
 
 def generate_custom_tone_post(
@@ -181,6 +366,9 @@ def generate_custom_tone_post(
     custom_tone: str,
     custom_prompt: Optional[str] = None,
     debug: bool = False,
+    few_shot_k: int = 0,
+    seed: Optional[int] = None,
+    use_cache: bool = True,
 ) -> Dict[str, Any]:
     """
     Generate a post with a custom user-defined tone.
@@ -192,6 +380,9 @@ def generate_custom_tone_post(
         custom_tone: User's custom tone description (e.g., "humorous and witty")
         custom_prompt: Optional custom prompt
         debug: Enable debug mode
+        few_shot_k: Number of curated example posts to inject into the prompt
+        seed: Sampling seed; a new one gives a fresh post for cached inputs
+        use_cache: Set False to skip groq_llm's response cache
 
     Returns:
         Dictionary with post data
@@ -203,9 +394,12 @@ def generate_custom_tone_post(
         custom_prompt=custom_prompt,
         tone=custom_tone,
         debug=debug,
+        examples=select_examples(topic, length, language, few_shot_k),
+        seed=seed,
+        use_cache=use_cache,
     )
 
-    hashtags = generate_groq_hashtags(topic)
+    hashtags = generate_groq_hashtags(topic, use_cache=use_cache)
     engagement = round(len(post_text) / 250.0, 2)
 
     result = {
@@ -221,7 +415,63 @@ def generate_custom_tone_post(
     return result
 
 
-# ===== MULTI-MODEL FEATURE (UNCHANGED - WORKING) =====
+# ===== MULTI-MODEL FEATURE =====
+
+# Model variants to compare; each key is a groq_llm.MODEL_REGISTRY entry routed to its own model id
+MODEL_VARIANTS = ["Llama-3.1-8B", "Llama-3.3-70B", "Llama-4-Scout"]
+
+
+def _generate_model_variant(
+    topic: str,
+    length: str,
+    language: str,
+    model_name: str,
+    custom_prompt: Optional[str] = None,
+    debug: bool = False,
+    examples: Optional[list] = None,
+    seed: Optional[int] = None,
+    use_cache: bool = True,
+) -> tuple:
+    """Generate the post with one registry model. Returns (model_name, result)."""
+    try:
+        # Same prompt for every model so the comparison is like-for-like
+        post_text, maybe_prompt = generate_groq_post(
+            topic=topic,
+            length_label=length,
+            language=language,
+            custom_prompt=custom_prompt,
+            tone="professional",
+            debug=debug,
+            model=model_name,
+            examples=examples,
+            seed=seed,
+            use_cache=use_cache,
+        )
+
+        hashtags = generate_groq_hashtags(topic, use_cache=use_cache)
+        engagement = round(len(post_text) / 250.0, 2)
+
+        spec = get_model_spec(model_name)
+        result = {
+            "post": post_text,
+            "hashtags": hashtags,
+            "engagement": engagement,
+            "model": model_name,
+            "model_id": spec["model"],
+            "latency": spec["latency"],
+        }
+        if debug:
+            result["debug_prompt"] = maybe_prompt
+        return model_name, result
+    except Exception as e:
+        return model_name, {
+            "post": f"Error generating for {model_name}: {str(e)}",
+            "hashtags": [],
+            "engagement": 0,
+            "model": model_name,
+            "error": True
+        }
+
 
 def generate_multi_model_posts(
     topic: str,
@@ -229,84 +479,119 @@ def generate_multi_model_posts(
     language: str,
     custom_prompt: Optional[str] = None,
     debug: bool = False,
-    use_parallel: bool = False,  # Changed to False by default for rate limit safety
+    few_shot_k: int = 0,
+    use_parallel: bool = False,
 ) -> Dict[str, Dict[str, Any]]:
     """
-    Generate post outputs for 3 'model style variants' for comparison.
-    Reduced from 4 to 3 to avoid rate limits.
+    Generate the same post with each model in MODEL_VARIANTS for comparison.
 
-    Returns dict: { "Concise": {...}, "Detailed": {...}, "Conversational": {...} }
+    Returns dict: { "Llama-3.1-8B": {...}, "Llama-3.3-70B": {...}, "Llama-4-Scout": {...} }
     """
+    variants = generate_variants(
+        topic=topic,
+        length=length,
+        language=language,
+        custom_prompt=custom_prompt,
+        debug=debug,
+        few_shot_k=few_shot_k,
+        include_tones=False,
+        include_models=True,
+        max_concurrency=2 if use_parallel else 1,
+    )
+    return variants["models"]
 
-    # Define model variants (reduced to 3 to avoid rate limits)
-    model_variants = {
-        "Llama-3.1-8B": "Respond in a concise, neutral style similar to a smaller LLM (brief, exact).",
-        "Llama-3.1-70B": "Respond with a richer, more detailed style (longer reasoning, more examples).",
-        "Groq": "Respond in a crisp, fast style with practical examples and short paragraphs.",
-    }
-
-    def _gen_for_model(model_name: str, model_instruction: str) -> tuple:
-        try:
-            # Build a model-specific prompt by prefixing an instruction
-            prefix = model_instruction
-            # Use custom_prompt if provided; otherwise use topic
-            base = custom_prompt if custom_prompt else topic
-            full_prompt = (prefix + "\n\n" + base).strip()
-
-            # Call the underlying generator with the full_prompt as topic
-            post_text, maybe_prompt = generate_groq_post(
-                topic=full_prompt,
-                length_label=length,
-                language=language,
-                custom_prompt=None,
-                tone="professional",
-                debug=debug,
-            )
 
-            hashtags = generate_groq_hashtags(topic)
-            engagement = round(len(post_text) / 250.0, 2)
-
-            result = {
-                "post": post_text,
-                "hashtags": hashtags,
-                "engagement": engagement,
-                "model": model_name,
-            }
-            if debug:
-                result["debug_prompt"] = maybe_prompt
-            return model_name, result
-        except Exception as e:
-            return model_name, {
-                "post": f"Error generating for {model_name}: {str(e)}",
-                "hashtags": [],
-                "engagement": 0,
-                "model": model_name,
-                "error": True
-            }
+# ===== VARIANT SCHEDULER (multi-tone + multi-model in one pool) =====
 
-    results: Dict[str, Dict[str, Any]] = {}
+def generate_variants(
+    topic: str,
+    length: str,
+    language: str,
+    custom_prompt: Optional[str] = None,
+    debug: bool = False,
+    few_shot_k: int = 0,
+    include_tones: bool = True,
+    include_models: bool = True,
+    batched_tones: bool = True,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    on_result: Optional[Callable[[str, str, Dict[str, Any]], None]] = None,
+    seed: Optional[int] = None,
+    use_cache: bool = True,
+) -> Dict[str, Dict[str, Dict[str, Any]]]:
+    """
+    Run every requested tone and model variant in one bounded worker pool.
 
-    if use_parallel:
-        # Parallel generation (faster but may hit rate limits)
-        with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
-            future_to_model = {
-                executor.submit(_gen_for_model, name, instr): name
-                for name, instr in model_variants.items()
-            }
-            for future in concurrent.futures.as_completed(future_to_model):
-                model_name, res = future.result()
-                results[model_name] = res
-    else:
-        # Sequential generation (safer, avoids rate limits)
-        for idx, (name, instr) in enumerate(model_variants.items()):
-            # Add delay between requests to avoid rate limits
-            if idx > 0:
-                time.sleep(2.0)  # 2 second delay between each model variant
-            
-            model_name, res = _gen_for_model(name, instr)
-            results[model_name] = res
+    Args:
+        few_shot_k: Number of curated example posts to inject into every prompt
+        include_tones: Generate the TONES variants
+        include_models: Generate the MODEL_VARIANTS variants
+        batched_tones: Request all tones in one JSON completion first; tones missing
+            from it are scheduled as individual jobs
+        max_concurrency: Maximum number of variants in flight at once. Requests are
+            still paced by the shared rate limiter in groq_llm.
+        on_result: Called as on_result(kind, name, result) in the calling thread as
+            soon as each variant finishes; kind is "tone" or "model"
+        seed, use_cache: Passed to every completion; a new seed gives fresh variants
+            for inputs that are already in the response cache
 
-    return results
+    Returns:
+        {"tones": {tone_name: result, ...}, "models": {model_name: result, ...}}
+        in TONES / MODEL_VARIANTS order.
+    """
+    tone_results: Dict[str, Dict[str, Any]] = {}
+    model_results: Dict[str, Dict[str, Any]] = {}
+    examples = select_examples(topic, length, language, few_shot_k)
+
+    def record(kind: str, name: str, result: Dict[str, Any]) -> None:
+        (tone_results if kind == "tone" else model_results)[name] = result
+        if on_result is not None:
+            on_result(kind, name, result)
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, max_concurrency)) as executor:
+        pending = {}
+
+        def submit_tone(tone_name: str) -> None:
+            future = executor.submit(
+                _generate_tone_variant, topic, length, language,
+                tone_name, TONES[tone_name], custom_prompt, debug, examples, seed, use_cache,
+            )
+            pending[future] = ("tone", tone_name)
 
+        if include_tones:
+            if batched_tones:
+                future = executor.submit(
+                    _generate_tone_batch, topic, length, language, dict(TONES), custom_prompt, debug, examples,
+                    seed, use_cache,
+                )
+                pending[future] = ("tone_batch", None)
+            else:
+                for tone_name in TONES:
+                    submit_tone(tone_name)
+
+        if include_models:
+            for model_name in MODEL_VARIANTS:
+                future = executor.submit(
+                    _generate_model_variant, topic, length, language,
+                    model_name, custom_prompt, debug, examples, seed, use_cache,
+                )
+                pending[future] = ("model", model_name)
+
+        while pending:
+            done, _ = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                kind, _name = pending.pop(future)
+                if kind == "tone_batch":
+                    batch = future.result()
+                    for tone_name in TONES:
+                        if tone_name in batch:
+                            record("tone", tone_name, batch[tone_name])
+                        else:
+                            submit_tone(tone_name)
+                else:
+                    name, result = future.result()
+                    record(kind, name, result)
 
-# End of post_generator.py
\ No newline at end of file
+    return {
+        "tones": {name: tone_results[name] for name in TONES if name in tone_results},
+        "models": {name: model_results[name] for name in MODEL_VARIANTS if name in model_results},
+    }
@@ -1,31 +1,211 @@
 import json
-from llm_helper import llm
-from langchain_core.prompts import PromptTemplate
-from langchain_core.output_parsers import JsonOutputParser
+import os
+import re
+import difflib
+import hashlib
+from collections import Counter, defaultdict
+from llm_helper import get_extraction_chain
+from jsonl_io import iter_journal, iter_records, run_journaled, RecordWriter
 from langchain_core.exceptions import OutputParserException
 
+# Persisted {original tag: unified tag}; reruns only unify tags missing from it
+TAG_MAPPING_PATH = "data/tag_mapping.json"
+# Cluster representatives sent to the LLM per unification prompt
+TAG_BATCH_SIZE = 80
+# difflib ratio above which two normalized tags are treated as the same tag
+TAG_SIMILARITY = 0.85
+# Shorter tags are only merged on an identical normalized form: one letter apart is
+# usually a different word there ("sales"/"scales", "news"/"new")
+FUZZY_TAG_MIN_CHARS = 8
+# Existing unified tags listed in each prompt so batches converge on the same names
+MAX_PROMPT_CATEGORIES = 150
+_TAG_NON_WORD = re.compile(r"[\W_]+")
+# Words ending in "s" that are not plurals, so "News" does not normalize to "new"
+_SINGULAR_S_WORDS = frozenset("""
+    news sales analytics ethics economics politics physics statistics logistics
+    series species mathematics
+    """.split())
 
-def process_posts(raw_file_path, processed_file_path=None):
-    with open(raw_file_path, encoding='utf-8') as file:
-        posts = json.load(file)
-        enriched_posts = []
+# Language heuristic: share of letters in Devanagari, or of words that are common
+# romanized Hindi, needed to call a post Hinglish without asking the LLM
+DEVANAGARI_MIN_SHARE = 0.2
+HINGLISH_MIN_SHARE = 0.15
+# At or below this share of romanized Hindi words the post is English
+ENGLISH_MAX_SHARE = 0.03
+# Shorter posts are left to the LLM
+MIN_WORDS_FOR_LANGUAGE = 6
+# Function words and very common vocabulary; words that are also English ("the", "main", "par") are left out
+ROMANIZED_HINDI_WORDS = frozenset("""
+    hai hain hota hoti hote tha thi kya kyu kyun kyon kaise kaisa kab kahan kaun
+    nahi nahin nhi haan toh bhi aur se ko ka ki ke mein
+    mera meri mere tera teri tere tum aap apna apni apne hum humne humko mujhe tujhe
+    unko usko uska uski yeh woh yaha yahan waha wahan abhi kabhi kuch kuchh
+    bahut bohot bhai yaar accha acha achi achha achhi baat logon karo karna karte
+    kiya kiye diya liya dekh dekho dekhna dekhte rahe rahi gaya gayi jana jata jaata
+    hoga hogi lekin phir sirf zindagi naukri paisa kaam wala wali wale kyunki agar
+    """.split())
+_WORD = re.compile(r"[a-z]+")
+
+
+def post_key(post):
+    """Stable id for a raw post, used to match journal entries across reruns."""
+    # surrogatepass: scraped text can contain lone surrogates from broken emoji
+    return hashlib.sha256(post['text'].encode('utf-8', 'surrogatepass')).hexdigest()
+
+
+def key_digest(key):
+    """16-byte form of a post_key, for the per-post sets kept in memory (a third of the hex string's size)."""
+    return bytes.fromhex(key)[:16]
+
+
+def scan_journal(journal_path, keys=None):
+    """
+    Read a metadata journal (one JSON object per line) and return
+    (key_digests of posts enriched successfully, set of tags used by those posts).
+    A post is only extracted again after an error, so each post has at most one
+    successful entry. Pass a set of key_digests to only consider those posts.
+    """
+    done = set()
+    unique_tags = set()
+    for entry in iter_journal(journal_path):
+        if 'post' not in entry:
+            continue
+        digest = key_digest(entry['key'])
+        if keys is not None and digest not in keys:
+            continue
+        done.add(digest)
+        unique_tags.update(entry['post'].get('tags', []))
+    return done, unique_tags
+
+
+def extract_metadata_batch(posts, journal_path, max_workers=4):
+    """
+    Extract metadata for every post not already in the journal, max_workers at a time.
+    `posts` may be any iterable (e.g. a streaming reader); at most a small window of
+    posts is in flight at once. Each enriched post (or error) is appended to the journal
+    as soon as it finishes, so an interrupted run resumes where it stopped.
+    Returns (key_digests of every post in `posts`, errors).
+    """
+    done, _ = scan_journal(journal_path)
+    seen = set()
+    skipped = extracted = 0
+    errors = []
+
+    def pending():
+        nonlocal skipped
         for post in posts:
-            metadata = extract_metadata(post['text'])
-            post_with_metadata = post | metadata
-            enriched_posts.append(post_with_metadata)
+            key = post_key(post)
+            digest = key_digest(key)
+            if digest in seen:
+                continue
+            seen.add(digest)
+            if digest in done:
+                skipped += 1
+                continue
+            yield key, post
+
+    def to_entry(key, post, metadata, error):
+        if error is not None:
+            return {'key': key, 'error': str(error)}
+        return {'key': key, 'post': post | metadata}
+
+    for entry in run_journaled(pending(), lambda post: extract_metadata(post['text']), journal_path,
+                               to_entry, max_workers, window=max(1, max_workers) * 4):
+        if 'error' in entry:
+            errors.append(entry)
+        else:
+            extracted += 1
+    # Only this input's keys are needed from here on
+    del done
+
+    print(f"Extracted metadata for {extracted} posts ({skipped} already in journal).")
+    return seen, errors
+
+
+def process_posts(raw_file_path, processed_file_path=None, max_workers=4, journal_path=None,
+                  tag_mapping_path=TAG_MAPPING_PATH):
+    """
+    Enrich raw posts with metadata and unified tags.
+
+    Input and output are streamed one post at a time; posts are never held in
+    memory together. What grows with the corpus is O(number of posts) bookkeeping:
+    a 16-byte key_digest per post (about 90 bytes with set overhead) plus the set of
+    unique tags. Paths ending in .jsonl are read/written as JSON Lines, anything
+    else as a JSON array. Posts are written in extraction order.
+
+    Args:
+        raw_file_path: JSON list or JSONL of {"text": ..., "engagement": ...} posts
+        processed_file_path: Where to write the enriched posts
+        max_workers: Concurrent metadata extractions
+        journal_path: Checkpoint file (default: processed_file_path + ".journal.jsonl");
+            reruns skip posts already extracted there, failed posts are retried
+        tag_mapping_path: Persisted tag -> unified tag mapping, extended with new tags
+    """
+    journal_path = journal_path or f"{processed_file_path}.journal.jsonl"
+
+    # The journal can hold posts from earlier runs on other inputs; only this input's posts are used
+    input_keys, errors = extract_metadata_batch(iter_records(raw_file_path), journal_path, max_workers)
+    if errors:
+        print(f"{len(errors)} posts failed metadata extraction and were skipped; "
+              f"rerun to retry them (details in {journal_path}).")
 
-    unified_tags = get_unified_tags(enriched_posts)
-    for post in enriched_posts:
-        current_tags = post['tags']
-        new_tags = {unified_tags[tag] for tag in current_tags}
-        post['tags'] = list(new_tags)
+    done, unique_tags = scan_journal(journal_path, input_keys)
+    unified_tags = get_unified_tags(unique_tags, tag_mapping_path)
 
-    with open(processed_file_path, encoding='utf-8', mode="w") as outfile:
-        json.dump(enriched_posts, outfile, indent=4)
+    # Each post has at most one successful journal entry (see scan_journal)
+    with RecordWriter(processed_file_path) as writer:
+        for entry in iter_journal(journal_path):
+            if 'post' not in entry or key_digest(entry['key']) not in done:
+                continue
+            post = entry['post']
+            post['tags'] = list({unified_tags.get(tag, tag) for tag in post['tags']})
+            writer.write(post)
+
+
+def count_lines(post):
+    """Number of non-empty lines in a post."""
+    return sum(1 for line in post.splitlines() if line.strip())
+
+
+def detect_language(post):
+    """
+    "English", "Hinglish", or None when the heuristic is unsure.
+    Devanagari script means Hinglish outright; otherwise the share of common
+    romanized Hindi words decides, with a grey zone left to the LLM.
+    """
+    letters = [ch for ch in post if ch.isalpha()]
+    if not letters:
+        return None
+    devanagari = sum(1 for ch in letters if "\u0900" <= ch <= "\u097f")
+    if devanagari / len(letters) >= DEVANAGARI_MIN_SHARE:
+        return "Hinglish"
+
+    words = _WORD.findall(post.lower())
+    if len(words) < MIN_WORDS_FOR_LANGUAGE:
+        return None
+    hindi_share = sum(1 for word in words if word in ROMANIZED_HINDI_WORDS) / len(words)
+    if hindi_share >= HINGLISH_MIN_SHARE:
+        return "Hinglish"
+    if hindi_share <= ENGLISH_MAX_SHARE:
+        return "English"
+    return None
 
 
 def extract_metadata(post):
-    template = '''
+    """
+    line_count is counted and language detected locally; the LLM is only asked
+    for tags, or for language as well when detect_language is unsure.
+    """
+    language = detect_language(post)
+    if language is None:
+        res = _extract_with_llm(METADATA_TEMPLATE, post)
+    else:
+        res = {"language": language, "tags": _extract_with_llm(TAGS_TEMPLATE, post)["tags"]}
+    res["line_count"] = count_lines(post)
+    return res
+
+
+METADATA_TEMPLATE = '''
     You are given a LinkedIn post. You need to extract number of lines, language of the post and tags.
     1. Return a valid JSON. No preamble. 
     2. JSON object should have exactly three keys: line_count, language and tags. 
@@ -36,27 +216,17 @@ def extract_metadata(post):
     {post}
     '''
 
-    pt = PromptTemplate.from_template(template)
-    chain = pt | llm
-    response = chain.invoke(input={"post": post})
-
-    try:
-        json_parser = JsonOutputParser()
-        res = json_parser.parse(response.content)
-    except OutputParserException:
-        raise OutputParserException("Context too big. Unable to parse jobs.")
-    return res
-
-
-def get_unified_tags(posts_with_metadata):
-    unique_tags = set()
-    # Loop through each post and extract the tags
-    for post in posts_with_metadata:
-        unique_tags.update(post['tags'])  # Add the tags to the set
-
-    unique_tags_list = ','.join(unique_tags)
+TAGS_TEMPLATE = '''
+    You are given a LinkedIn post. You need to extract tags.
+    1. Return a valid JSON. No preamble. 
+    2. JSON object should have exactly one key: tags. 
+    3. tags is an array of text tags. Extract maximum two tags.
+    
+    Here is the actual post on which you need to perform this task:  
+    {post}
+    '''
 
-    template = '''I will give you a list of tags. You need to unify tags with the following requirements,
+UNIFY_TAGS_TEMPLATE = '''I will give you a list of tags. You need to unify tags with the following requirements,
     1. Tags are unified and merged to create a shorter list. 
        Example 1: "Jobseekers", "Job Hunting" can be all merged into a single tag "Job Search". 
        Example 2: "Motivation", "Inspiration", "Drive" can be mapped to "Motivation"
@@ -66,19 +236,142 @@ def get_unified_tags(posts_with_metadata):
     3. Output should be a JSON object, No preamble
     3. Output should have mapping of original tag and the unified tag. 
        For example: {{"Jobseekers": "Job Search",  "Job Hunting": "Job Search", "Motivation": "Motivation}}
+    4. Reuse one of these existing unified tags whenever it fits: {categories}
     
     Here is the list of tags: 
     {tags}
     '''
-    pt = PromptTemplate.from_template(template)
-    chain = pt | llm
-    response = chain.invoke(input={"tags": str(unique_tags_list)})
+
+
+def _extract_with_llm(template, post):
     try:
-        json_parser = JsonOutputParser()
-        res = json_parser.parse(response.content)
+        return get_extraction_chain(template).invoke({"post": post})
+    except OutputParserException:
+        raise OutputParserException("Context too big. Unable to parse jobs.")
+
+
+def normalize_tag(tag):
+    """Case/punctuation/plural-insensitive form of a tag, used to cluster near-duplicates."""
+    words = _TAG_NON_WORD.sub(" ", tag.lower()).split()
+    return " ".join(
+        w[:-1] if len(w) > 3 and w.endswith("s") and not w.endswith("ss") and w not in _SINGULAR_S_WORDS else w
+        for w in words
+    )
+
+
+def _close_tag(norm, candidates, cutoff=TAG_SIMILARITY):
+    """The candidate near-identical to norm (difflib ratio >= cutoff), or None; short tags never match."""
+    if len(norm) < FUZZY_TAG_MIN_CHARS:
+        return None
+    match = difflib.get_close_matches(
+        norm, [c for c in candidates if len(c) >= FUZZY_TAG_MIN_CHARS], n=1, cutoff=cutoff)
+    return match[0] if match else None
+
+
+def cluster_tags(tags, cutoff=TAG_SIMILARITY):
+    """
+    Group tags locally before asking the LLM: tags with the same normalized form
+    go together, then groups whose normalized forms are near-identical
+    (difflib ratio >= cutoff, both at least FUZZY_TAG_MIN_CHARS long) are merged.
+    Returns {representative: [tags]}.
+    """
+    by_norm = defaultdict(list)
+    for tag in sorted(tags):
+        by_norm[normalize_tag(tag)].append(tag)
+
+    clusters = {}
+    # Candidates are bucketed by first character to keep matching far below O(n^2)
+    buckets = defaultdict(list)
+    for norm in sorted(by_norm, key=lambda n: (len(n), n)):
+        bucket = buckets[norm[:1]]
+        match = _close_tag(norm, bucket, cutoff)
+        if match:
+            clusters[match].extend(by_norm[norm])
+        else:
+            clusters[norm] = list(by_norm[norm])
+            bucket.append(norm)
+    return {members[0]: members for members in clusters.values()}
+
+
+def load_tag_mapping(mapping_path):
+    try:
+        with open(mapping_path, encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def save_tag_mapping(mapping, mapping_path):
+    tmp_path = f"{mapping_path}.tmp"
+    with open(tmp_path, encoding='utf-8', mode='w') as f:
+        json.dump(mapping, f, indent=4, sort_keys=True)
+    os.replace(tmp_path, mapping_path)
+
+
+def get_unified_tags(unique_tags, mapping_path=TAG_MAPPING_PATH, batch_size=TAG_BATCH_SIZE):
+    """
+    Map every tag to a unified tag, reusing the mapping persisted at mapping_path.
+
+    Only tags missing from that mapping are processed: they are clustered locally,
+    clusters that match an already-known unified tag are mapped without the LLM,
+    and the remaining cluster representatives are sent in batches of batch_size.
+    Each batch sees the unified tags chosen so far so batches converge on the same
+    names. The mapping is saved after every batch.
+    """
+    mapping = load_tag_mapping(mapping_path)
+    new_tags = [tag for tag in unique_tags if tag not in mapping]
+    if not new_tags:
+        return mapping
+
+    known = {}
+    for tag, unified in mapping.items():
+        known.setdefault(normalize_tag(unified), unified)
+        known.setdefault(normalize_tag(tag), unified)
+
+    pending = {}
+    for representative, members in cluster_tags(new_tags).items():
+        norm = normalize_tag(representative)
+        unified = known.get(norm)
+        if unified is None:
+            close = _close_tag(norm, known)
+            unified = known[close] if close else None
+        if unified is None:
+            pending[representative] = members
+        else:
+            for tag in members:
+                mapping[tag] = unified
+
+    representatives = list(pending)
+    if representatives:
+        print(f"Unifying {len(representatives)} tag clusters ({len(new_tags)} new tags)...")
+    for start in range(0, len(representatives), batch_size):
+        batch = representatives[start:start + batch_size]
+        batch_mapping = _unify_tag_batch(batch, _top_categories(mapping))
+        for representative in batch:
+            unified = batch_mapping.get(representative) or representative
+            # Snap onto an existing unified tag when the LLM returns a near-duplicate of one
+            unified = known.setdefault(normalize_tag(unified), unified)
+            for tag in pending[representative]:
+                mapping[tag] = unified
+        save_tag_mapping(mapping, mapping_path)
+
+    if not representatives:
+        save_tag_mapping(mapping, mapping_path)
+    return mapping
+
+
+def _top_categories(mapping, limit=MAX_PROMPT_CATEGORIES):
+    """The most used unified tags so far, to steer later batches onto the same names."""
+    return [tag for tag, _ in Counter(mapping.values()).most_common(limit)]
+
+
+def _unify_tag_batch(tags, categories):
+    try:
+        return get_extraction_chain(UNIFY_TAGS_TEMPLATE).invoke(
+            {"tags": ','.join(tags), "categories": ', '.join(categories) or "none yet"}
+        )
     except OutputParserException:
         raise OutputParserException("Context too big. Unable to parse jobs.")
-    return res
 
 
 if __name__ == "__main__":
@@ -0,0 +1,161 @@
+"""
+rate_limiter.py - Process-wide request/token budget for the Groq API
+Tracks requests-per-minute and tokens-per-minute as token buckets, one set per
+model since Groq limits each model separately, folds in the server's
+retry-after / x-ratelimit-* headers, and tells each caller how long to wait so
+calls are scheduled as early as the budget allows.
+"""
+
+import asyncio
+import os
+import re
+import threading
+import time
+from typing import Dict, Mapping, Optional
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+
+
+def parse_reset_duration(value: Optional[str]) -> Optional[float]:
+    """
+    Parse Groq reset headers into seconds.
+    Accepts plain seconds ("7.66") or unit strings ("2m59.56s", "120ms", "1h2m").
+    """
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = _DURATION_PART.findall(value)
+    if not parts:
+        return None
+    scale = {"h": 3600.0, "m": 60.0, "s": 1.0, "ms": 0.001}
+    return sum(float(num) * scale[unit] for num, unit in parts)
+
+
+class RateLimiter:
+    def __init__(self, requests_per_minute: float, tokens_per_minute: float):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self._lock = threading.Lock()
+        self._request_balance = float(requests_per_minute)
+        self._token_balance = float(tokens_per_minute)
+        self._last_refill = time.monotonic()
+        self._blocked_until = 0.0
+
+    @classmethod
+    def from_env(cls) -> "RateLimiter":
+        return cls(
+            requests_per_minute=float(os.getenv("GROQ_REQUESTS_PER_MINUTE", "30")),
+            tokens_per_minute=float(os.getenv("GROQ_TOKENS_PER_MINUTE", "6000")),
+        )
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._last_refill
+        self._last_refill = now
+        self._request_balance = min(
+            float(self.requests_per_minute),
+            self._request_balance + elapsed * self.requests_per_minute / 60.0,
+        )
+        self._token_balance = min(
+            float(self.tokens_per_minute),
+            self._token_balance + elapsed * self.tokens_per_minute / 60.0,
+        )
+
+    def reserve(self, tokens: int = 0) -> float:
+        """
+        Reserve budget for one request and return how many seconds to wait
+        before sending it. Balances may go negative; later callers then queue
+        behind earlier reservations instead of racing for the same budget.
+        """
+        tokens = min(max(int(tokens), 0), int(self.tokens_per_minute))
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._request_balance -= 1
+            self._token_balance -= tokens
+            wait = max(0.0, self._blocked_until - now)
+            if self._request_balance < 0:
+                wait = max(wait, -self._request_balance * 60.0 / self.requests_per_minute)
+            if self._token_balance < 0:
+                wait = max(wait, -self._token_balance * 60.0 / self.tokens_per_minute)
+            return wait
+
+    def settle(self, reserved: int, used: int) -> None:
+        """
+        Credit back the part of a reservation a finished request did not use.
+        reserve() charges the worst case (full max_tokens); the response's usage
+        is usually far smaller.
+        """
+        reserved = min(max(int(reserved), 0), int(self.tokens_per_minute))
+        unused = reserved - max(int(used), 0)
+        if unused <= 0:
+            return
+        with self._lock:
+            self._refill(time.monotonic())
+            self._token_balance = min(float(self.tokens_per_minute), self._token_balance + unused)
+
+    def acquire(self, tokens: int = 0) -> float:
+        """Block until the request fits the budget. Returns the time waited."""
+        wait = self.reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def aacquire(self, tokens: int = 0) -> float:
+        """Async counterpart of acquire()."""
+        wait = self.reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def block_for(self, seconds: float) -> None:
+        """Hold every caller back for the given number of seconds."""
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+
+    def update_from_headers(self, headers: Optional[Mapping[str, str]]) -> None:
+        """Align the local budget with what the API reports as remaining."""
+        if not headers:
+            return
+
+        retry_after = parse_reset_duration(headers.get("retry-after"))
+        if retry_after is not None:
+            self.block_for(retry_after)
+
+        remaining_requests = headers.get("x-ratelimit-remaining-requests")
+        if remaining_requests is not None and remaining_requests.strip() == "0":
+            reset = parse_reset_duration(headers.get("x-ratelimit-reset-requests"))
+            if reset is not None:
+                self.block_for(reset)
+
+        remaining_tokens = headers.get("x-ratelimit-remaining-tokens")
+        if remaining_tokens is not None:
+            try:
+                remaining = float(remaining_tokens)
+            except ValueError:
+                return
+            with self._lock:
+                self._refill(time.monotonic())
+                self._token_balance = min(self._token_balance, remaining)
+            if remaining <= 0:
+                reset = parse_reset_duration(headers.get("x-ratelimit-reset-tokens"))
+                if reset is not None:
+                    self.block_for(reset)
+
+
+# Groq's RPM/TPM limits (and its rate-limit headers) are per model, so each model
+# id gets its own budget, shared by every generation entry point in this process
+_limiters: Dict[str, RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def limiter_for(model: str) -> RateLimiter:
+    """Return the process-wide limiter for a Groq model id, creating it on first use."""
+    with _limiters_lock:
+        model_limiter = _limiters.get(model)
+        if model_limiter is None:
+            model_limiter = _limiters[model] = RateLimiter.from_env()
+        return model_limiter
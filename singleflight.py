@@ -0,0 +1,75 @@
+"""
+singleflight.py - Coalesce concurrent calls that would do the same work
+While a call for a key is running, other callers with the same key wait for it
+and get its result (or its exception) instead of starting their own. Nothing
+is kept once the call finishes; caching results is left to the caller.
+"""
+
+import asyncio
+import threading
+import weakref
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+        # asyncio tasks belong to one event loop, so in-flight tasks are tracked per loop
+        self._tasks: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Task]]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        """Run fn() unless a call for key is already running in another thread; then wait for that one."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+    async def ado(self, key: str, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """Async counterpart of do(): await factory() unless a call for key is already running on this loop."""
+        loop = asyncio.get_running_loop()
+        tasks = self._tasks.get(loop)
+        if tasks is None:
+            tasks = self._tasks[loop] = {}
+        task = tasks.get(key)
+        if task is None:
+            task = asyncio.ensure_future(factory())
+            tasks[key] = task
+            task.add_done_callback(lambda done, key=key: _forget(tasks, key, done))
+        # shield: one caller being cancelled must not cancel the call others are waiting on
+        return await asyncio.shield(task)
+
+
+def _forget(tasks: Dict[str, asyncio.Task], key: str, task: asyncio.Task) -> None:
+    tasks.pop(key, None)
+    # Mark the exception as retrieved in case every waiter was cancelled before it finished
+    if not task.cancelled():
+        task.exception()
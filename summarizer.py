@@ -0,0 +1,103 @@
+"""
+summarizer.py - Local extractive summaries for file-based prompts
+Sentences are scored with TextRank over a TF-IDF cosine-similarity graph and
+the best ones are kept, in document order, until a character budget is used.
+"""
+
+import re
+from typing import List
+
+import numpy as np
+
+# ~4 characters per token; 2000 chars keeps file context around 500 input tokens
+DEFAULT_SUMMARY_CHARS = 2000
+TEXTRANK_DAMPING = 0.85
+TEXTRANK_ITERATIONS = 50
+# Earlier sentences get a small boost: titles, summaries and headlines come first
+POSITION_WEIGHT = 0.15
+# Fragments with fewer content words (headings, list numbers) are skipped unless nothing else is left
+MIN_SENTENCE_WORDS = 3
+
+# Sentence ends, or line breaks (bullets and slide lines are units of their own)
+# ("1. Item" list markers are not sentence ends)
+_SENTENCE_SPLIT = re.compile(r"(?<=[^\d\s][.!?])\s+|\n+")
+_WORD = re.compile(r"[a-z0-9][a-z0-9+#.\-]*[a-z0-9+#]|[a-z0-9]")
+_STOPWORDS = frozenset("""
+    a an and are as at be been but by for from has have he her his i in is it its
+    of on or our she that the their them they this to was we were which will with
+    you your my me us not no so if than then there these those also into about
+""".split())
+
+
+def split_sentences(text: str) -> List[str]:
+    return [s.strip() for s in _SENTENCE_SPLIT.split(text) if s and s.strip()]
+
+
+def tokenize(text: str) -> List[str]:
+    return [w for w in _WORD.findall(text.lower()) if w not in _STOPWORDS]
+
+
+def score_sentences(sentences: List[str]) -> np.ndarray:
+    """TextRank score per sentence (higher is more central to the document)."""
+    n = len(sentences)
+    tokenized = [tokenize(s) for s in sentences]
+    vocabulary = {}
+    for words in tokenized:
+        for word in words:
+            vocabulary.setdefault(word, len(vocabulary))
+    if not vocabulary:
+        return np.zeros(n)
+
+    tf = np.zeros((n, len(vocabulary)))
+    for row, words in enumerate(tokenized):
+        for word in words:
+            tf[row, vocabulary[word]] += 1
+    document_frequency = np.count_nonzero(tf, axis=0)
+    tfidf = tf * (np.log((1 + n) / (1 + document_frequency)) + 1)
+    norms = np.linalg.norm(tfidf, axis=1, keepdims=True)
+    tfidf = np.divide(tfidf, norms, out=np.zeros_like(tfidf), where=norms > 0)
+
+    similarity = tfidf @ tfidf.T
+    np.fill_diagonal(similarity, 0.0)
+    out_weight = similarity.sum(axis=1, keepdims=True)
+    transition = np.divide(similarity, out_weight, out=np.full_like(similarity, 1.0 / n), where=out_weight > 0)
+
+    scores = np.full(n, 1.0 / n)
+    for _ in range(TEXTRANK_ITERATIONS):
+        updated = (1 - TEXTRANK_DAMPING) / n + TEXTRANK_DAMPING * (transition.T @ scores)
+        if np.abs(updated - scores).sum() < 1e-6:
+            scores = updated
+            break
+        scores = updated
+
+    position_bonus = POSITION_WEIGHT * (1.0 - np.arange(n) / n) / n
+    return scores + position_bonus
+
+
+def summarize(text: str, max_chars: int = DEFAULT_SUMMARY_CHARS) -> str:
+    """
+    Most informative sentences of `text` that fit in max_chars, in their original
+    order. Text that already fits is returned unchanged.
+    """
+    text = text.strip()
+    if len(text) <= max_chars:
+        return text
+    sentences = split_sentences(text)
+    if len(sentences) <= 1:
+        return text[:max_chars]
+
+    scores = score_sentences(sentences)
+    candidates = [i for i, s in enumerate(sentences) if len(tokenize(s)) >= MIN_SENTENCE_WORDS]
+    if not candidates:
+        candidates = list(range(len(sentences)))
+    chosen, used, seen = [], 0, set()
+    for index in sorted(candidates, key=lambda i: -scores[i]):
+        length = len(sentences[index]) + 1
+        if used + length > max_chars or sentences[index] in seen:
+            continue
+        chosen.append(index)
+        seen.add(sentences[index])
+        used += length
+    if not chosen:
+        return sentences[int(np.argmax(scores))][:max_chars]
+    return "\n".join(sentences[i] for i in sorted(chosen))
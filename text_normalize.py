@@ -0,0 +1,139 @@
+"""
+text_normalize.py - Cleaning and HTML rendering for generated posts
+One place for the text normalization used by the LLM layer and the UI.
+Every pattern is compiled once at import.
+"""
+
+import ast
+import html
+import json
+import re
+from typing import Any, Dict
+
+_NEWLINES = re.compile(r"\r\n?")
+# Runs are spelled with a literal prefix ("\.\.\.+" rather than "\.{3,}") so the
+# regex engine can skip ahead with a fast substring search
+_ELLIPSIS_RUNS = re.compile(r"\.\.\.+")
+_DASH_RUNS = re.compile(r"---+")
+_SPACE_RUNS = re.compile(r"\s\s\s+")
+
+_PARAGRAPH_HTML = "<p style='margin:8px 0; line-height:1.6;'>{}</p>"
+
+
+def clean_text(s: str) -> str:
+    """Trim, collapse excessive blank lines/spaces."""
+    if not s:
+        return ""
+    # Normalize Windows newlines, strip leading/trailing spaces per line, collapse blank lines
+    # (a plain loop over split lines beats a regex pass here; see bench_normalize.py)
+    out = []
+    prev_blank = False
+    for ln in s.replace("\r\n", "\n").split("\n"):
+        ln = ln.strip()
+        is_blank = not ln
+        if is_blank and prev_blank:
+            continue
+        out.append(ln)
+        prev_blank = is_blank
+    return "\n".join(out).strip()
+
+
+def _parse_dict(s: str):
+    """The dict encoded in s (JSON or a Python literal), or None."""
+    try:
+        parsed = json.loads(s)
+        if isinstance(parsed, dict):
+            return parsed
+    except ValueError:
+        pass
+    try:
+        parsed = ast.literal_eval(s)
+        if isinstance(parsed, dict):
+            return parsed
+    except (ValueError, SyntaxError, TypeError, MemoryError, RecursionError):
+        pass
+    return None
+
+
+def extract_and_clean(raw_result: Any) -> Dict[str, Any]:
+    """
+    Accept various shapes from generate_post and clean them
+    """
+    out = {"post": "", "hashtags": [], "engagement": None}
+
+    # Fast path: generators return dicts, so the string parsers below rarely run
+    if isinstance(raw_result, dict):
+        out["post"] = raw_result.get("post") or raw_result.get("text") or raw_result.get("content") or ""
+        tags = raw_result.get("hashtags", raw_result.get("tags", []))
+        if isinstance(tags, str):
+            out["hashtags"] = [t.strip() for t in tags.split(",") if t.strip()]
+        elif isinstance(tags, list):
+            out["hashtags"] = tags
+        out["engagement"] = raw_result.get("engagement", raw_result.get("score"))
+        out["tone"] = raw_result.get("tone", "")
+        out["model_id"] = raw_result.get("model_id", "")
+        if raw_result.get("error"):
+            out["error"] = True
+        return clean_text_output(out)
+
+    if isinstance(raw_result, str):
+        s = raw_result.strip()
+        # Only strings that contain a brace can hold a serialized dict
+        has_brace = "{" in s and "}" in s
+        if has_brace:
+            parsed = _parse_dict(s)
+            if parsed is not None:
+                return extract_and_clean(parsed)
+
+        unescaped = s
+        if "\\" in s:
+            try:
+                unescaped = bytes(s, "utf-8").decode("unicode_escape")
+            except UnicodeDecodeError:
+                pass
+
+        if "{" in unescaped and "}" in unescaped:
+            start = unescaped.find("{")
+            end = unescaped.rfind("}") + 1
+            try:
+                parsed = json.loads(unescaped[start:end])
+                if isinstance(parsed, dict):
+                    return extract_and_clean(parsed)
+            except ValueError:
+                pass
+
+        out["post"] = unescaped
+        return clean_text_output(out)
+
+    out["post"] = str(raw_result)
+    return clean_text_output(out)
+
+
+def clean_text_output(out: Dict[str, Any]) -> Dict[str, Any]:
+    """Render the cleaned post as out['post_html'] and tidy out['hashtags']."""
+    post = out.get("post", "") or ""
+    if "\\" in post:
+        post = post.replace("\\/", "/").replace("\\n", "\n").replace("\\", "")
+
+    post = _ELLIPSIS_RUNS.sub("...", post)
+    post = _DASH_RUNS.sub("---", post)
+    post = _SPACE_RUNS.sub("  ", post)
+
+    post = _NEWLINES.sub("\n", post)
+    post = post.strip(" \n\r\t\"'")
+    safe = html.escape(post)
+
+    paragraphs = [p.strip() for p in safe.split("\n\n") if p.strip()]
+    if paragraphs:
+        out["post_html"] = "".join(_PARAGRAPH_HTML.format(p.replace("\n", " ")) for p in paragraphs)
+    else:
+        out["post_html"] = _PARAGRAPH_HTML.format(safe)
+
+    tags = out.get("hashtags") or []
+    if isinstance(tags, str):
+        out["hashtags"] = [t.strip() for t in tags.split(",") if t.strip()]
+    elif isinstance(tags, list):
+        out["hashtags"] = [t.strip() if isinstance(t, str) else str(t) for t in tags]
+    else:
+        out["hashtags"] = []
+    return out